@@ -51,6 +51,7 @@
 // We need to tell SWIG that std::vector<std::string> is a vector of strings
 namespace std {
     %template(StringVector) vector<string>;
+    %template(IntVector) vector<int>;
 }
 
 // Tells swig that 'std::string& strError' must be treated as output parameters
@@ -81,6 +82,11 @@ public:
     void setLogger(ILogger* pLogger);
 
     ISelectionCriterionTypeInterface* createSelectionCriterionType(bool bIsInclusive);
+    bool addSelectionCriterionTypeValuePairs(
+            ISelectionCriterionTypeInterface* pSelectionCriterionType,
+            const std::vector<int>& aiValues,
+            const std::vector<std::string>& astrValues,
+            std::string& strError);
     ISelectionCriterionInterface* createSelectionCriterion(const std::string& strName,
             const ISelectionCriterionTypeInterface* pSelectionCriterionType);
     ISelectionCriterionInterface* getSelectionCriterion(const std::string& strName);
@@ -98,6 +104,7 @@ public:
     bool getFailureOnFailedSettingsLoad();
 
     void setSchemaFolderLocation(const std::string& strSchemaFolderLocation);
+    void setConfigurationFileContent(const std::string& strConfigurationFileContent);
     void setValidateSchemasOnStart(bool bValidate);
     bool getValidateSchemasOnStart() const;
 
@@ -123,6 +130,8 @@ public:
     bool accessParameterValue(const std::string& strPath, std::string& strValue, bool bSet, std::string& strError);
     bool accessConfigurationValue(const std::string &strDomain, const std::string &strConfiguration, const std::string& strPath, std::string& strValue, bool bSet, std::string& strError);
 %clear std::string& strValue;
+    // Errors are appended to 'astrErrors', which should be a StringVector
+    bool setConfigurationValues(const std::string& strDomain, const std::string& strConfiguration, const std::vector<std::string>& astrPaths, const std::vector<std::string>& astrValues, std::vector<std::string>& astrErrors);
 
     bool getParameterMapping(const std::string& strPath, std::string& strValue) const;
 
@@ -145,6 +154,8 @@ public:
 
     // Configurable element - domain association
     bool addConfigurableElementToDomain(const std::string& strDomain, const std::string& strConfigurableElementPath, std::string& strError);
+    // Errors are appended to 'astrErrors', which should be a StringVector
+    bool addConfigurableElementsToDomain(const std::string& strDomain, const std::vector<std::string>& astrConfigurableElementPaths, std::vector<std::string>& astrErrors);
     bool removeConfigurableElementFromDomain(const std::string& strDomain, const std::string& strConfigurableElementPath, std::string& strError);
     bool split(const std::string& strDomain, const std::string& strConfigurableElementPath, std::string& strError);
     bool setElementSequence(const std::string& strDomain, const std::string& strConfiguration, const std::vector<std::string>& astrNewElementSequence, std::string& strError);
@@ -157,6 +168,8 @@ public:
 
     bool importDomainsXml(const std::string& strXmlSource, bool bWithSettings, bool bFromFile,
                           std::string& strError);
+    bool importSingleDomainXml(const std::string& strXmlSource, bool bOverwrite, bool bFromFile,
+                               std::string& strError);
     bool importSingleDomainXml(const std::string& strXmlSource, bool bOverwrite,
                                std::string& strError);
 
@@ -169,6 +182,11 @@ public:
     bool exportSingleDomainXml(std::string& strXmlDest, const std::string& strDomainName, bool bWithSettings,
                                bool bToFile, std::string& strError) const;
 %clear std::string& strXmlDest;
+    // 'iFd' is a file descriptor, e.g. the result of 'fileno()' on a python
+    // file object; it is left open.
+    bool exportDomainsXmlToFd(int iFd, bool bWithSettings, std::string& strError) const;
+
+    bool exportDomainsBinary(const std::string& strFileName, std::string& strError);
 };
 
 // SWIG nested class support is not complete - cf.
@@ -83,6 +83,7 @@
 #include "EnumValuePair.h"
 #include "Subsystem.h"
 #include "XmlFileDocSink.h"
+#include "XmlFdDocSink.h"
 #include "XmlFileDocSource.h"
 #include "XmlStringDocSink.h"
 #include "XmlStringDocSource.h"
@@ -519,7 +520,14 @@ bool CParameterMgr::loadFrameworkConfiguration(string& strError)
     // Parse Structure XML file
     CXmlElementSerializingContext elementSerializingContext(strError);
 
-    if (!xmlParse(elementSerializingContext, getFrameworkConfiguration(), _strXmlConfigurationFilePath, _strXmlConfigurationFolderPath, EFrameworkConfigurationLibrary)) {
+    if (!_strXmlConfigurationFileContent.empty()) {
+
+        // Configuration content given in place of the file's
+        if (!xmlParseString(elementSerializingContext, getFrameworkConfiguration(), _strXmlConfigurationFileContent, _strXmlConfigurationFilePath, _strXmlConfigurationFolderPath, EFrameworkConfigurationLibrary)) {
+
+            return false;
+        }
+    } else if (!xmlParse(elementSerializingContext, getFrameworkConfiguration(), _strXmlConfigurationFilePath, _strXmlConfigurationFolderPath, EFrameworkConfigurationLibrary)) {
 
         return false;
     }
@@ -666,8 +674,7 @@ bool CParameterMgr::loadSettingsFromConfigFile(string& strError)
         return false;
     }
     // We have loaded the whole system structure, compute checksum
-    const CSystemClass* pSystemClass = getConstSystemClass();
-    _uiStructureChecksum = pSystemClass->computeStructureChecksum() + getConfigurableDomains()->computeStructureChecksum() + getSelectionCriteria()->computeStructureChecksum();
+    updateStructureChecksum();
 
     // Load binary settings if any provided
     if (pBinarySettingsFileLocation && !pConfigurableDomains->serializeSettings(strXmlBinarySettingsFilePath, false, _uiStructureChecksum, strError)) {
@@ -678,8 +685,14 @@ bool CParameterMgr::loadSettingsFromConfigFile(string& strError)
     return true;
 }
 
-bool CParameterMgr::importDomainFromFile(const string& strXmlFilePath, bool bOverwrite,
-                                         string& strError)
+void CParameterMgr::updateStructureChecksum()
+{
+    const CSystemClass* pSystemClass = getConstSystemClass();
+    _uiStructureChecksum = pSystemClass->computeStructureChecksum() + getConfigurableDomains()->computeStructureChecksum() + getSelectionCriteria()->computeStructureChecksum();
+}
+
+bool CParameterMgr::importDomain(const string& strXmlSource, bool bOverwrite, bool bFromFile,
+                                 string& strError)
 {
     CXmlDomainImportContext xmlDomainImportContext(strError, true, *getSystemClass());
 
@@ -693,8 +706,18 @@ bool CParameterMgr::importDomainFromFile(const string& strXmlFilePath, bool bOve
     // We initialize the domain with an empty name but since we have set the isDomainStandalone
     // context, the name will be retrieved during de-serialization
     std::auto_ptr<CConfigurableDomain> standaloneDomain(new CConfigurableDomain());
-    bool bSuccess = xmlParse(xmlDomainImportContext, standaloneDomain.get(),
-                             strXmlFilePath, "", EParameterConfigurationLibrary, "");
+    bool bSuccess;
+
+    if (bFromFile) {
+
+        bSuccess = xmlParse(xmlDomainImportContext, standaloneDomain.get(),
+                            strXmlSource, "", EParameterConfigurationLibrary, "");
+    } else {
+
+        // Without any file, relative inclusions are resolved against the current directory
+        bSuccess = xmlParseString(xmlDomainImportContext, standaloneDomain.get(),
+                                  strXmlSource, "", "", EParameterConfigurationLibrary, "");
+    }
 
     if (!bSuccess) {
         return false;
@@ -733,12 +756,37 @@ bool CParameterMgr::xmlParse(CXmlElementSerializingContext& elementSerializingCo
                                                _bValidateSchemasOnStart));
     }
 
+    return xmlProcess(elementSerializingContext, pRootElement, *fileDocSource);
+}
+
+bool CParameterMgr::xmlParseString(CXmlElementSerializingContext& elementSerializingContext, CElement* pRootElement, const string& strXmlContent, const string& strXmlBaseUrl, const string& strXmlFolder, CParameterMgr::ElementLibrary eElementLibrary, const string& strNameAttrituteName)
+{
+    // Init serializing context
+    elementSerializingContext.set(_pElementLibrarySet->getElementLibrary(
+                                      eElementLibrary), strXmlFolder, _strSchemaFolderLocation);
+
+    // Get Schema file associated to root element
+    string strXmlSchemaFilePath = _strSchemaFolderLocation + "/" + pRootElement->getKind() + ".xsd";
+
+    // The root element name is only checked if a name attribute is given. Inclusions are
+    // processed, as for a file.
+    CXmlStringDocSource stringDocSource(strXmlContent, strXmlBaseUrl, strXmlSchemaFilePath,
+                                        pRootElement->getKind(),
+                                        strNameAttrituteName.empty() ? "" : pRootElement->getName(),
+                                        strNameAttrituteName,
+                                        _bValidateSchemasOnStart);
+
+    return xmlProcess(elementSerializingContext, pRootElement, stringDocSource);
+}
+
+bool CParameterMgr::xmlProcess(CXmlElementSerializingContext& elementSerializingContext, CElement* pRootElement, CXmlDocSource& docSource)
+{
     // Start clean
     pRootElement->clean();
 
     CXmlMemoryDocSink memorySink(pRootElement);
 
-    if (!memorySink.process(*fileDocSource, elementSerializingContext)) {
+    if (!memorySink.process(docSource, elementSerializingContext)) {
         //Cleanup
         pRootElement->clean();
 
@@ -874,6 +922,11 @@ void CParameterMgr::setSchemaFolderLocation(const string& strSchemaFolderLocatio
     _strSchemaFolderLocation = strSchemaFolderLocation;
 }
 
+void CParameterMgr::setConfigurationFileContent(const string& strConfigurationFileContent)
+{
+    _strXmlConfigurationFileContent = strConfigurationFileContent;
+}
+
 void CParameterMgr::setValidateSchemasOnStart(bool bValidate)
 {
     _bValidateSchemasOnStart = bValidate;
@@ -1629,7 +1682,7 @@ CParameterMgr::CCommandHandler::CommandStatus CParameterMgr::importConfigurableD
         }
     }
 
-    return importSingleDomainXml(remoteCommand.getArgument(0), bOverwrite, strResult) ?
+    return importSingleDomainXml(remoteCommand.getArgument(0), bOverwrite, true, strResult) ?
         CCommandHandler::EDone : CCommandHandler::EFailed;
 }
 
@@ -2262,7 +2315,7 @@ bool CParameterMgr::importDomainsXml(const string& strXmlSource, bool bWithSetti
 }
 
 bool CParameterMgr::importSingleDomainXml(const string& strXmlSource, bool bOverwrite,
-                                          string& strError)
+                                          bool bFromFile, string& strError)
 {
     if (!checkTuningModeOn(strError)) {
 
@@ -2270,14 +2323,14 @@ bool CParameterMgr::importSingleDomainXml(const string& strXmlSource, bool bOver
     }
 
     // check path is absolute
-    if (strXmlSource[0] != '/') {
+    if (bFromFile && strXmlSource[0] != '/') {
 
         strError = "Please provide absolute path";
 
         return false;
     }
 
-    return importDomainFromFile(strXmlSource, bOverwrite, strError);
+    return importDomain(strXmlSource, bOverwrite, bFromFile, strError);
 }
 
 bool CParameterMgr::serializeElement(string& strXmlDest,
@@ -2292,6 +2345,24 @@ bool CParameterMgr::serializeElement(string& strXmlDest,
         return false;
     }
 
+    if (bToFile) {
+
+        // Use a doc sink to write the doc data in a file
+        CXmlFileDocSink fileSink(strXmlDest);
+
+        return serializeElement(fileSink, xmlSerializingContext, element);
+    }
+
+    // Use a doc sink to write the doc data in a string
+    CXmlStringDocSink stringSink(strXmlDest);
+
+    return serializeElement(stringSink, xmlSerializingContext, element);
+}
+
+bool CParameterMgr::serializeElement(CXmlDocSink& xmlDocSink,
+                                     CXmlSerializingContext& xmlSerializingContext,
+                                     const CElement& element) const
+{
     // Get Schema file associated to root element
     string strXmlSchemaFilePath = _strSchemaFolderLocation + "/" +
                                   element.getKind() + ".xsd";
@@ -2301,29 +2372,26 @@ bool CParameterMgr::serializeElement(string& strXmlDest,
                                      strXmlSchemaFilePath, "parameter-framework",
                                      getVersion(), _bValidateSchemasOnStart);
 
-    // Xml Sink
-    CXmlDocSink* pSink;
+    return xmlDocSink.process(memorySource, xmlSerializingContext);
+}
 
-    if (bToFile) {
+bool CParameterMgr::exportDomainsXml(string& strXmlDest, bool bWithSettings, bool bToFile,
+                                     string& strError) const
+{
+    const CConfigurableDomains* pConfigurableDomains = getConstConfigurableDomains();
 
-        // Use a doc sink to write the doc data in a file
-        pSink = new CXmlFileDocSink(strXmlDest);
+    CXmlDomainExportContext xmlDomainExportContext(strError, bWithSettings);
 
-    } else {
+    xmlDomainExportContext.setValueSpaceRaw(_bValueSpaceIsRaw);
 
-        // Use a doc sink to write the doc data in a string
-        // TODO: use a stream rather than a string
-        pSink = new CXmlStringDocSink(strXmlDest);
-    }
+    xmlDomainExportContext.setOutputRawFormat(_bOutputRawFormatIsHex);
 
-    bool bProcessSuccess = pSink->process(memorySource, xmlSerializingContext);
 
-    delete pSink;
-    return bProcessSuccess;
+    return serializeElement(strXmlDest, xmlDomainExportContext, bToFile,
+                                    *pConfigurableDomains, strError);
 }
 
-bool CParameterMgr::exportDomainsXml(string& strXmlDest, bool bWithSettings, bool bToFile,
-                                     string& strError) const
+bool CParameterMgr::exportDomainsXmlToFd(int iFd, bool bWithSettings, string& strError) const
 {
     const CConfigurableDomains* pConfigurableDomains = getConstConfigurableDomains();
 
@@ -2333,9 +2401,10 @@ bool CParameterMgr::exportDomainsXml(string& strXmlDest, bool bWithSettings, boo
 
     xmlDomainExportContext.setOutputRawFormat(_bOutputRawFormatIsHex);
 
+    // Use a doc sink streaming the doc data to the file descriptor
+    CXmlFdDocSink fdSink(iFd);
 
-    return serializeElement(strXmlDest, xmlDomainExportContext, bToFile,
-                                    *pConfigurableDomains, strError);
+    return serializeElement(fdSink, xmlDomainExportContext, *pConfigurableDomains);
 }
 
 bool CParameterMgr::exportSingleDomainXml(string& strXmlDest, const string& strDomainName,
@@ -2379,6 +2448,9 @@ bool CParameterMgr::importDomainsBinary(const string& strFileName, string& strEr
     // Root element
     CConfigurableDomains* pConfigurableDomains = getConfigurableDomains();
 
+    // Domains may have been tuned since settings were loaded
+    updateStructureChecksum();
+
     // Serialize in
     return pConfigurableDomains->serializeSettings(strFileName, false, _uiStructureChecksum, strError);
 }
@@ -2396,6 +2468,9 @@ bool CParameterMgr::exportDomainsBinary(const string& strFileName, string& strEr
     // Root element
     CConfigurableDomains* pConfigurableDomains = getConfigurableDomains();
 
+    // Domains may have been tuned since settings were loaded
+    updateStructureChecksum();
+
     // Serialize out
     return pConfigurableDomains->serializeSettings(strFileName, true, _uiStructureChecksum, strError);
 }
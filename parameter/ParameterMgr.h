@@ -189,6 +189,16 @@ public:
      */
     void setSchemaFolderLocation(const std::string& strSchemaFolderLocation);
 
+    /** Override the content of the configuration file
+     *
+     * Should be called before start. The configuration is then read from the given content
+     * instead of the configuration file; relative paths are still relative to the folder of
+     * the configuration file.
+     *
+     * @param[in] strConfigurationFileContent XML content of the configuration file
+     */
+    void setConfigurationFileContent(const std::string& strConfigurationFileContent);
+
     /** Should .xml files be validated on start ?
      *
      * @param[in] bValidate:
@@ -291,15 +301,15 @@ public:
       * Method that imports a single Configurable Domain from an Xml source.
       *
       * @param[in] strXmlSource a string containing an xml description or a path to an xml file
-      * @param[in] bWithSettings a boolean that determines if the settings should be used in the
-      * xml description
+      * @param[in] bOverwrite a boolean that determines if an existing domain of the same name
+      * should be replaced
       * @param[in] bFromFile a boolean that determines if the source is an xml description in
       * strXmlSource or contained in a file. In that case strXmlSource is just the file path.
       * @param[out] strError is used as the error output
       *
       * @return false if any error occurs
       */
-    bool importSingleDomainXml(const std::string& strXmlSource, bool bOverwrite,
+    bool importSingleDomainXml(const std::string& strXmlSource, bool bOverwrite, bool bFromFile,
                                std::string& strError);
 
     /**
@@ -317,6 +327,21 @@ public:
     bool exportDomainsXml(std::string& strXmlDest, bool bWithSettings, bool bToFile,
                           std::string& strError) const;
 
+    /**
+      * Method that exports Configurable Domains to an open file descriptor.
+      *
+      * The xml description is written as it is serialized, it is never held as a whole in a
+      * string. The file descriptor is not closed.
+      *
+      * @param[in] iFd the file descriptor the xml description is written to
+      * @param[in] bWithSettings a boolean that determines if the settings should be used in the
+      * xml description
+      * @param[out] strError is used as the error output
+      *
+      * @return false if any error occurs, true otherwise.
+      */
+    bool exportDomainsXmlToFd(int iFd, bool bWithSettings, std::string& strError) const;
+
     /**
       * Method that exports a given Configurable Domain to an Xml destination.
       *
@@ -515,9 +540,19 @@ private:
     bool loadSettings(std::string& strError);
     bool loadSettingsFromConfigFile(std::string& strError);
 
+    // Structure checksum of the system class, the configurable domains and the selection
+    // criteria, binary settings are bound to
+    void updateStructureChecksum();
+
     // Parse XML file into Root element
     bool xmlParse(CXmlElementSerializingContext& elementSerializingContext, CElement* pRootElement, const std::string& strXmlFilePath, const std::string& strXmlFolder, ElementLibrary eElementLibrary, const std::string& strNameAttrituteName = "Name");
 
+    // Parse XML content into Root element, its inclusions being relative to strXmlBaseUrl
+    bool xmlParseString(CXmlElementSerializingContext& elementSerializingContext, CElement* pRootElement, const std::string& strXmlContent, const std::string& strXmlBaseUrl, const std::string& strXmlFolder, ElementLibrary eElementLibrary, const std::string& strNameAttrituteName = "Name");
+
+    // Instantiate Root element from an XML document source
+    bool xmlProcess(CXmlElementSerializingContext& elementSerializingContext, CElement* pRootElement, CXmlDocSource& docSource);
+
     /**
      * Export an element object to an Xml destination.
      *
@@ -535,15 +570,30 @@ private:
                           bool bToFile, const CElement& element, std::string& strError) const;
 
     /**
-      * Method that imports a single Configurable Domain, with settings, from an Xml file.
+     * Export an element object to an Xml doc sink.
+     *
+     * @param[in] xmlDocSink the sink the xml description is given to.
+     * @param[in] xmlSerializingContext the serializing context
+     * @param[in] element object to be serialized.
+     *
+     * @return false if any error occurs, true otherwise.
+     */
+    bool serializeElement(CXmlDocSink& xmlDocSink, CXmlSerializingContext& xmlSerializingContext,
+                          const CElement& element) const;
+
+    /**
+      * Method that imports a single Configurable Domain, with settings, from an Xml source.
       *
-      * @param[in] strXmlFilePath absolute path to the xml file containing the domain
+      * @param[in] strXmlSource absolute path to the xml file containing the domain or xml
+      * description of the domain
+      * @param[in] bFromFile a boolean that determines if strXmlSource is a file path or an xml
+      * description
       * @param[out] strError is used as the error output
       *
       * @return false if any error occurs
       */
-    bool importDomainFromFile(const std::string& strXmlFilePath, bool bOverwrite,
-                              std::string& strError);
+    bool importDomain(const std::string& strXmlSource, bool bOverwrite, bool bFromFile,
+                      std::string& strError);
 
 
     // Framework Configuration
@@ -593,6 +643,7 @@ private:
     // XML parsing, object creation handling
     std::string _strXmlConfigurationFilePath; // Configuration file path
     std::string _strXmlConfigurationFolderPath; // Root folder for configuration file
+    std::string _strXmlConfigurationFileContent; // Configuration file content, if overridden
     std::string _strSchemaFolderLocation; // Place where schemas stand
 
     // Subsystem plugin location
@@ -81,6 +81,31 @@ ISelectionCriterionTypeInterface* CParameterMgrFullConnector::createSelectionCri
     return _pParameterMgr->createSelectionCriterionType(bIsInclusive);
 }
 
+bool CParameterMgrFullConnector::addSelectionCriterionTypeValuePairs(
+        ISelectionCriterionTypeInterface* pSelectionCriterionType,
+        const std::vector<int>& aiValues,
+        const std::vector<string>& astrValues,
+        string& strError)
+{
+    if (aiValues.size() != astrValues.size()) {
+
+        strError = "Numerical and literal value counts differ";
+
+        return false;
+    }
+
+    for (size_t uiIndex = 0; uiIndex < aiValues.size(); uiIndex++) {
+
+        if (!pSelectionCriterionType->addValuePair(aiValues[uiIndex], astrValues[uiIndex])) {
+
+            strError = "Value pair rejected: " + astrValues[uiIndex];
+
+            return false;
+        }
+    }
+    return true;
+}
+
 ISelectionCriterionInterface* CParameterMgrFullConnector::createSelectionCriterion(
         const string& strName,
         const ISelectionCriterionTypeInterface* pSelectionCriterionType)
@@ -140,6 +165,12 @@ void CParameterMgrFullConnector::setSchemaFolderLocation(const string& strSchema
     _pParameterMgr->setSchemaFolderLocation(strSchemaFolderLocation);
 }
 
+void CParameterMgrFullConnector::setConfigurationFileContent(
+        const string& strConfigurationFileContent)
+{
+    _pParameterMgr->setConfigurationFileContent(strConfigurationFileContent);
+}
+
 void CParameterMgrFullConnector::setValidateSchemasOnStart(bool bValidate)
 {
     _pParameterMgr->setValidateSchemasOnStart(bValidate);
@@ -210,6 +241,37 @@ bool CParameterMgrFullConnector::accessConfigurationValue(const string &strDomai
             bSet, strError);
 }
 
+bool CParameterMgrFullConnector::setConfigurationValues(const string& strDomain,
+                                                        const string& strConfiguration,
+                                                        const std::vector<string>& astrPaths,
+                                                        const std::vector<string>& astrValues,
+                                                        std::vector<string>& astrErrors)
+{
+    if (astrPaths.size() != astrValues.size()) {
+
+        astrErrors.push_back("Path and value counts differ");
+        return false;
+    }
+
+    bool bSuccess = true;
+
+    for (size_t index = 0; index < astrPaths.size(); index++) {
+
+        // Values are in/out parameters of accessConfigurationValue
+        string strValue = astrValues[index];
+        string strError;
+
+        if (!_pParameterMgr->accessConfigurationValue(strDomain, strConfiguration,
+                                                      astrPaths[index], strValue, true,
+                                                      strError)) {
+
+            astrErrors.push_back(strError);
+            bSuccess = false;
+        }
+    }
+    return bSuccess;
+}
+
 bool CParameterMgrFullConnector::getParameterMapping(const string& strPath, string& strValue) const
 {
     return _pParameterMgr->getParameterMapping(strPath, strValue);
@@ -291,6 +353,27 @@ bool CParameterMgrFullConnector::addConfigurableElementToDomain(const string& st
             strError);
 }
 
+bool CParameterMgrFullConnector::addConfigurableElementsToDomain(const string& strDomain,
+        const std::vector<string>& astrConfigurableElementPaths,
+        std::vector<string>& astrErrors)
+{
+    bool bSuccess = true;
+
+    for (size_t index = 0; index < astrConfigurableElementPaths.size(); index++) {
+
+        string strError;
+
+        if (!_pParameterMgr->addConfigurableElementToDomain(strDomain,
+                                                            astrConfigurableElementPaths[index],
+                                                            strError)) {
+
+            astrErrors.push_back(strError);
+            bSuccess = false;
+        }
+    }
+    return bSuccess;
+}
+
 bool CParameterMgrFullConnector::removeConfigurableElementFromDomain(const string& strDomain,
         const string& strConfigurableElementPath, string& strError)
 {
@@ -349,10 +432,22 @@ bool CParameterMgrFullConnector::exportDomainsXml(string& strXmlDest, bool bWith
     return _pParameterMgr->exportDomainsXml(strXmlDest, bWithSettings, bToFile, strError);
 }
 
+bool CParameterMgrFullConnector::exportDomainsXmlToFd(int iFd, bool bWithSettings,
+                                                      string& strError) const
+{
+    return _pParameterMgr->exportDomainsXmlToFd(iFd, bWithSettings, strError);
+}
+
+bool CParameterMgrFullConnector::importSingleDomainXml(const string& strXmlSource, bool bOverwrite,
+                                                       bool bFromFile, string& strError)
+{
+    return _pParameterMgr->importSingleDomainXml(strXmlSource, bOverwrite, bFromFile, strError);
+}
+
 bool CParameterMgrFullConnector::importSingleDomainXml(const string& strXmlSource, bool bOverwrite,
                                                        string& strError)
 {
-    return _pParameterMgr->importSingleDomainXml(strXmlSource, bOverwrite, strError);
+    return importSingleDomainXml(strXmlSource, bOverwrite, true, strError);
 }
 
 bool CParameterMgrFullConnector::exportSingleDomainXml(string& strXmlDest,
@@ -363,3 +458,8 @@ bool CParameterMgrFullConnector::exportSingleDomainXml(string& strXmlDest,
     return _pParameterMgr->exportSingleDomainXml(strXmlDest, strDomainName, bWithSettings, bToFile,
             strError);
 }
+
+bool CParameterMgrFullConnector::exportDomainsBinary(const string& strFileName, string& strError)
+{
+    return _pParameterMgr->exportDomainsBinary(strFileName, strError);
+}
@@ -36,6 +36,7 @@
 
 #include <string>
 #include <list>
+#include <vector>
 #include <memory>
 #include <stdint.h>
 
@@ -67,6 +68,22 @@ public:
     CParameterHandle* createParameterHandle(const std::string& strPath, std::string& strError);
 
     ISelectionCriterionTypeInterface* createSelectionCriterionType(bool bIsInclusive);
+    /**
+     * Add several value pairs to a criterion type, as addValuePair would do for each of them.
+     *
+     * @param[in] pSelectionCriterionType the criterion type to add the value pairs to
+     * @param[in] aiValues the numerical values
+     * @param[in] astrValues the literal values, in the same order as the numerical ones
+     * @param[out] strError the first rejected pair, if any
+     *
+     * @return true if all pairs were added, false otherwise; the pairs following a rejected
+     *         one are not added.
+     */
+    bool addSelectionCriterionTypeValuePairs(
+            ISelectionCriterionTypeInterface* pSelectionCriterionType,
+            const std::vector<int>& aiValues,
+            const std::vector<std::string>& astrValues,
+            std::string& strError);
     ISelectionCriterionInterface* createSelectionCriterion(const std::string& strName,
             const ISelectionCriterionTypeInterface* pSelectionCriterionType);
     ISelectionCriterionInterface* getSelectionCriterion(const std::string& strName);
@@ -123,6 +140,16 @@ public:
      */
     void setSchemaFolderLocation(const std::string& strSchemaFolderLocation);
 
+    /** Override the content of the configuration file
+     *
+     * Should be called before start. The configuration is then read from the given content
+     * instead of the configuration file; relative paths are still relative to the folder of
+     * the configuration file.
+     *
+     * @param[in] strConfigurationFileContent XML content of the configuration file
+     */
+    void setConfigurationFileContent(const std::string& strConfigurationFileContent);
+
     /** Should .xml files be validated on start ?
      *
      * @param[in] bValidate:
@@ -161,6 +188,26 @@ public:
     bool accessParameterValue(const std::string& strPath, std::string& strValue, bool bSet, std::string& strError);
     bool accessConfigurationValue(const std::string &strDomain, const std::string &strConfiguration, const std::string& strPath, std::string& strValue, bool bSet, std::string& strError);
 
+    /**
+     * Set several parameter values of a configuration at once.
+     *
+     * Each value is set as by accessConfigurationValue. A failure does not prevent the
+     * following values from being set.
+     *
+     * @param[in] strDomain the domain of the configuration
+     * @param[in] strConfiguration the configuration to modify
+     * @param[in] astrPaths the paths of the parameters to set
+     * @param[in] astrValues the values to set, in the same order as the paths
+     * @param[out] astrErrors the errors of the values that could not be set, if any
+     *
+     * @return true if all values were set
+     */
+    bool setConfigurationValues(const std::string& strDomain,
+                                const std::string& strConfiguration,
+                                const std::vector<std::string>& astrPaths,
+                                const std::vector<std::string>& astrValues,
+                                std::vector<std::string>& astrErrors);
+
     /**
      * Returns the element mapping corresponding to the path given in parameter.
      *
@@ -188,6 +235,22 @@ public:
 
     // Configurable element - domain association
     bool addConfigurableElementToDomain(const std::string& strDomain, const std::string& strConfigurableElementPath, std::string& strError);
+
+    /**
+     * Add several configurable elements to a domain at once.
+     *
+     * Each element is added as by addConfigurableElementToDomain. A failure does not prevent
+     * the following elements from being added.
+     *
+     * @param[in] strDomain the domain to modify
+     * @param[in] astrConfigurableElementPaths the paths of the elements to add
+     * @param[out] astrErrors the errors of the elements that could not be added, if any
+     *
+     * @return true if all elements were added
+     */
+    bool addConfigurableElementsToDomain(const std::string& strDomain,
+                                         const std::vector<std::string>& astrConfigurableElementPaths,
+                                         std::vector<std::string>& astrErrors);
     bool removeConfigurableElementFromDomain(const std::string& strDomain, const std::string& strConfigurableElementPath, std::string& strError);
     bool split(const std::string& strDomain, const std::string& strConfigurableElementPath, std::string& strError);
     bool setElementSequence(const std::string& strDomain, const std::string& strConfiguration, const std::vector<std::string>& astrNewElementSequence, std::string& strError);
@@ -216,10 +279,25 @@ public:
       * Method that imports a single Configurable Domain from an Xml source.
       *
       * @param[in] strXmlSource a string containing an xml description or a path to an xml file
-      * @param[in] bWithSettings a boolean that determines if the settings should be used in the
-      * xml description
+      * @param[in] bOverwrite a boolean that determines if an existing domain of the same name
+      * should be replaced
       * @param[in] bFromFile a boolean that determines if the source is an xml description in
       * strXmlSource or contained in a file. In that case strXmlSource is just the file path.
+      * In both cases, XInclude inclusions are processed; those of an xml description are
+      * relative to the current directory.
+      * @param[out] strError is used as the error output
+      *
+      * @return false if any error occurs
+      */
+    bool importSingleDomainXml(const std::string& strXmlSource, bool bOverwrite, bool bFromFile,
+                               std::string& strError);
+
+    /**
+      * Method that imports a single Configurable Domain from an Xml file.
+      *
+      * @param[in] strXmlSource a path to an xml file
+      * @param[in] bOverwrite a boolean that determines if an existing domain of the same name
+      * should be replaced
       * @param[out] strError is used as the error output
       *
       * @return false if any error occurs
@@ -243,6 +321,21 @@ public:
     bool exportDomainsXml(std::string& strXmlDest, bool bWithSettings, bool bToFile,
                           std::string& strError) const;
 
+    /**
+      * Method that exports Configurable Domains to an open file descriptor.
+      *
+      * The xml description is written as it is serialized, it is never held as a whole in a
+      * string. The file descriptor is not closed.
+      *
+      * @param[in] iFd the file descriptor the xml description is written to
+      * @param[in] bWithSettings a boolean that determines if the settings should be used in the
+      * xml description
+      * @param[out] strError is used as the error output
+      *
+      * @return false if any error occurs, true otherwise.
+      */
+    bool exportDomainsXmlToFd(int iFd, bool bWithSettings, std::string& strError) const;
+
     /**
       * Method that exports a given Configurable Domain to an Xml destination.
       *
@@ -259,6 +352,20 @@ public:
     bool exportSingleDomainXml(std::string& strXmlDest, const std::string& strDomainName, bool bWithSettings,
                                bool bToFile, std::string& strError) const;
 
+    /**
+      * Method that exports the settings of the Configurable Domains to a binary file.
+      *
+      * The file can be given to the parameter-framework as BinarySettingsFileLocation, along with
+      * the Configurable Domains exported without settings. It is only valid for the exact same
+      * structure, selection criteria and domains, which are checked through a checksum on load.
+      *
+      * @param[in] strFileName absolute path of the binary settings file
+      * @param[out] strError is used as the error output
+      *
+      * @return false if any error occurs, true otherwise.
+      */
+    bool exportDomainsBinary(const std::string& strFileName, std::string& strError);
+
 private:
     // disallow copying because this class manages raw pointers' lifecycle
     CParameterMgrFullConnector(const CParameterMgrFullConnector&);
@@ -0,0 +1,235 @@
+#!/usr/bin/python2.7
+#
+# Copyright (c) 2015, Intel Corporation
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification,
+# are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation and/or
+# other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR
+# ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON
+# ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""End-to-end tests of domainGenerator.py through the parameter-framework
+Python bindings
+
+The settings are generated from the files of this folder, copied into a
+temporary folder so that a test may modify them."""
+
+import PyPfw
+
+import logging
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+import xml.etree.ElementTree as ElementTree
+
+testFolder = os.path.dirname(os.path.realpath(__file__))
+domainGenerator = os.path.join(testFolder,
+        os.pardir, os.pardir, "tools", "xmlGenerator", "domainGenerator.py")
+
+inputFiles = [
+        "ParameterFrameworkConfiguration.xml",
+        "TestClass.xml",
+        "VirtualSubsystem.xml",
+        "Criteria.txt",
+        "Contrast.xml",
+        "Audio.pfw",
+        "Video.pfw"]
+
+# Loads the domains and their binary settings, as a target does
+targetConfiguration = """<?xml version="1.0" encoding="UTF-8"?>
+<ParameterFrameworkConfiguration SystemClassName="Test" ServerPort="5067" TuningAllowed="true">
+    <SubsystemPlugins>
+    </SubsystemPlugins>
+    <StructureDescriptionFileLocation Path="TestClass.xml"/>
+    <SettingsConfiguration>
+        <ConfigurableDomainsFileLocation Path="Domains.xml"/>
+        <BinarySettingsFileLocation Path="Settings.bin"/>
+    </SettingsConfiguration>
+</ParameterFrameworkConfiguration>
+"""
+
+class PfwLogger(PyPfw.ILogger):
+    def __init__(self):
+        super(PfwLogger, self).__init__()
+        self.__logger = logging.root.getChild("parameter-framework")
+
+    def log(self, is_warning, message):
+        log_func = self.__logger.warning if is_warning else self.__logger.info
+        log_func(message)
+
+class DomainGeneratorTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        for inputFile in inputFiles:
+            shutil.copy(os.path.join(testFolder, inputFile), self.folder)
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def path(self, name):
+        return os.path.join(self.folder, name)
+
+    def generate(self, *args):
+        """Run domainGenerator on the inputs and return its output"""
+        command = [sys.executable, domainGenerator,
+                "--toplevel-config", self.path("ParameterFrameworkConfiguration.xml"),
+                "--criteria", self.path("Criteria.txt"),
+                "--add-domains", self.path("Contrast.xml"),
+                "--add-edds", self.path("Audio.pfw"), self.path("Video.pfw")]
+        command += args
+
+        generator = subprocess.Popen(command, cwd=self.folder,
+                stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        output, errors = generator.communicate()
+        self.assertEqual(generator.returncode, 0, errors)
+
+        return output
+
+    def edit(self, name, old, new):
+        with open(self.path(name)) as inputFile:
+            content = inputFile.read()
+        self.assertIn(old, content)
+        with open(self.path(name), 'w') as inputFile:
+            inputFile.write(content.replace(old, new))
+
+    def getDomainNames(self, settings):
+        return [domain.get("Name") for domain in
+                ElementTree.fromstring(settings).findall("ConfigurableDomain")]
+
+class TestGeneration(DomainGeneratorTestCase):
+
+    def testFullBuild(self):
+        settings = self.generate()
+
+        # Single domain files come first, then the EDD files, in order
+        self.assertEqual(self.getDomainNames(settings),
+                ["Contrast", "Volume", "Mute", "Brightness"])
+
+        value = ElementTree.fromstring(settings).find(
+                "ConfigurableDomain[@Name='Volume']/Settings/"
+                "Configuration[@Name='Default']/ConfigurableElement/IntegerParameter")
+        self.assertEqual(value.text, "50")
+
+    def testParallelBuild(self):
+        reference = self.generate()
+
+        self.assertEqual(self.generate("--jobs", "2"), reference)
+        self.assertEqual(self.generate("--injection-jobs", "2"), reference)
+        self.assertEqual(self.generate("--jobs", "2", "--injection-jobs", "3"), reference)
+
+    def testEddCache(self):
+        reference = self.generate()
+        cache = self.path("cache")
+
+        # First run stores the translations, second one loads them
+        self.assertEqual(self.generate("--edd-cache-dir", cache), reference)
+        entries = [os.path.join(cache, entry) for entry in os.listdir(cache)]
+        self.assertEqual(len(entries), 2)
+        self.assertEqual(self.generate("--edd-cache-dir", cache), reference)
+
+        # Unreadable entries are ignored
+        for entry in entries:
+            with open(entry, 'wb') as entryFile:
+                entryFile.write("[[")
+        self.assertEqual(self.generate("--edd-cache-dir", cache), reference)
+
+    def testIncrementalBuild(self):
+        manifest = self.path("Manifest.json")
+        previous = self.path("Previous.xml")
+
+        def generateIncrementally():
+            settings = self.generate("--manifest", manifest,
+                    "--previous-output", previous)
+            with open(previous, 'w') as previousFile:
+                previousFile.write(settings)
+            return settings
+
+        with open(previous, 'w') as previousFile:
+            previousFile.write(self.generate("--manifest", manifest))
+
+        # Only the domains of the modified EDD file are generated again; they
+        # keep their place among the others
+        self.edit("Audio.pfw", "volume = 50", "volume = 60")
+        settings = generateIncrementally()
+        self.assertEqual(settings, self.generate())
+        value = ElementTree.fromstring(settings).find(
+                "ConfigurableDomain[@Name='Volume']/Settings/"
+                "Configuration[@Name='Default']/ConfigurableElement/IntegerParameter")
+        self.assertEqual(value.text, "60")
+
+        # Same for the first domain source
+        self.edit("Contrast.xml", ">50<", ">70<")
+        self.assertEqual(generateIncrementally(), self.generate())
+
+        # A change of the structure alters how the settings are written: all
+        # of them are generated again
+        self.edit("VirtualSubsystem.xml",
+                '<IntegerParameter Name="brightness" Size="8" Signed="false" Max="100"/>',
+                '<FixedPointParameter Name="brightness" Size="16" Integral="7" Fractional="8"/>')
+        self.assertEqual(generateIncrementally(), self.generate())
+
+    def testBinarySettings(self):
+        reference = self.generate()
+        domains = self.generate("--binary-settings", self.path("Settings.bin"))
+        self.assertEqual(self.getDomainNames(domains), self.getDomainNames(reference))
+
+        with open(self.path("Domains.xml"), 'w') as domainsFile:
+            domainsFile.write(domains)
+        with open(self.path("TargetConfiguration.xml"), 'w') as configurationFile:
+            configurationFile.write(targetConfiguration)
+
+        pfw = PyPfw.ParameterFramework(self.path("TargetConfiguration.xml"))
+        logger = PfwLogger()
+        pfw.setLogger(logger)
+        pfw.setForceNoRemoteInterface(True)
+        pfw.setFailureOnFailedSettingsLoad(True)
+
+        # As on target, each criterion has a type of its own
+        with open(self.path("Criteria.txt")) as criteria:
+            for criterion in criteria:
+                kind, name, _, values = criterion.split(None, 3)
+                inclusive = kind == "InclusiveCriterion"
+                criterionType = pfw.createSelectionCriterionType(inclusive)
+                for numerical, literal in enumerate(values.split()):
+                    if inclusive:
+                        numerical = 1 << numerical
+                    criterionType.addValuePair(numerical, literal)
+                pfw.createSelectionCriterion(name, criterionType)
+
+        # The binary settings are rejected unless they match the structure
+        # checksum of the target
+        ok, error = pfw.start()
+        self.assertTrue(ok, error)
+
+        # Once loaded, the settings are the ones of an XML generation
+        pfw.setSchemaFolderLocation("Schemas")
+        ok, settings, error = pfw.exportDomainsXml("", True, False)
+        self.assertTrue(ok, error)
+        self.assertEqual(settings, reference)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -44,6 +44,18 @@ import xml.dom.minidom
 import sys
 import re
 import logging
+import io
+import gzip
+import mmap
+import json
+import multiprocessing
+
+try:
+    # lzma is only needed for xz compressed logs and may be missing from
+    # python builds without liblzma
+    import lzma
+except ImportError:
+    lzma = None
 
 FORMAT = '%(levelname)s: %(message)s'
 logging.basicConfig(stream=sys.stderr, level=logging.WARNING, format=FORMAT)
@@ -65,6 +77,11 @@ class DuplicatedChildError(ChildError):
     def __str__(self):
         return 'Add existing child "%s" in "%s".' % (self.child, self.parent)
 
+class PartialStateMismatchError(ChildError):
+    def __str__(self):
+        return ('Partial coverage state "%s" does not match "%s": '
+                'was it computed from the same domain file?' % (self.child, self.parent))
+
 class Element():
     """Root class for all coverage elements"""
     tag = "element"
@@ -73,6 +90,8 @@ class Element():
 
         self.parent = None
         self.children = []
+        # First child of each name, children keeps the insertion order
+        self.childrenByName = {}
 
         self.nbUse = 0
 
@@ -104,10 +123,10 @@ class Element():
 
     def getChildFromName(self, childName):
 
-        for child in self.children :
+        child = self.childrenByName.get(childName)
 
-            if child.getName() == childName :
-                return child
+        if child :
+            return child
 
         self.debug('Child "%s" not found' % childName, logging.ERROR)
 
@@ -122,6 +141,7 @@ class Element():
     def addChild(self, child):
         self.debug("new child: " + child.name)
         self.children.append(child)
+        self.childrenByName.setdefault(child.getName(), child)
         child._adoptedBy(self)
 
     def _adoptedBy(self, parent):
@@ -268,6 +288,33 @@ class Element():
 
         return child.operationOnChild(path, operation)
 
+    def getPartialState(self):
+        """Return the coverage counters of the element and its descendants
+
+        The state is only made of builtin types so that it can be sent
+        between processes or saved, then merged with mergePartialState.
+        """
+        return {
+                "name": self.name,
+                "nbUse": self.nbUse,
+                "children": [child.getPartialState() for child in self.children]
+                }
+
+    def mergePartialState(self, state):
+        """Add the coverage counters of a partial state to the element
+
+        By default, the element and the one the state was taken from must have
+        the same structure: children are merged by position.
+        """
+        if (state["name"] != self.name or
+                len(state["children"]) != len(self.children)):
+            raise PartialStateMismatchError(self, state["name"])
+
+        self.nbUse += state["nbUse"]
+
+        for child, childState in zip(self.children, state["children"]):
+            child.mergePartialState(childState)
+
 
 
     def debug(self, stringOrFunction, level=logging.DEBUG):
@@ -463,24 +510,44 @@ class CriteronStates(Element):
     """Root of configuration application criterion state"""
     tag = "CriterionStates"
 
+    def __init__(self, name):
+        super().__init__(name)
+        # Criteria snapshot children indexed by their state key
+        self.criteriaByState = {}
+
+    def _addCriteria(self, stateKey, criteria):
+        self.criteriaByState[stateKey] = criteria
+        self.addChild(criteria)
+
     def parentUsed(self, criteria):
-        """Add criteria to child if not exist, if exist increase it's nbUse"""
+        """Add a snapshot of criteria to child if not exist, if exist increase it's nbUse"""
         self._incNbUse()
 
-        matches = [child for child in self.children if child == criteria]
-
-        assert(len(matches) <= 1)
+        stateKey = criteria.getStateKey()
+        currentcriteria = self.criteriaByState.get(stateKey)
 
-        if matches :
+        if currentcriteria :
             self.debug("Criteria state has already been encounter")
-            currentcriteria = matches[0]
         else :
             self.debug("Criteria state has never been encounter, saving it")
-            currentcriteria = criteria
-            self.addChild(criteria)
+            currentcriteria = criteria.export()
+            self._addCriteria(stateKey, currentcriteria)
 
         currentcriteria.parentUsed()
 
+    def mergePartialState(self, state):
+        """Merge the criteria states, adding those never encountered"""
+        self.nbUse += state["nbUse"]
+
+        for criteriaState in state["children"]:
+            stateKey = Criteria.getPartialStateKey(criteriaState)
+            criteria = self.criteriaByState.get(stateKey)
+
+            if criteria :
+                criteria.mergePartialState(criteriaState)
+            else :
+                self._addCriteria(stateKey, Criteria.fromPartialState(criteriaState))
+
 
 
 class Configuration(FromDomElement, DomPopulatedElement):
@@ -528,7 +595,7 @@ class Configuration(FromDomElement, DomPopulatedElement):
         self._tellParentThatChildUsed()
 
         # Propagate to criterion coverage
-        self.criteronStates.parentUsed(criteria.export())
+        self.criteronStates.parentUsed(criteria)
 
         # Propagate to rules
         if not self.rootRule.usedIfApplicable(criteria) :
@@ -687,6 +754,33 @@ class Criterion(Element):
         attributes["Type"] = self.inclusivenessTranslate[self.isInclusif]
         return attributes
 
+    def getPartialState(self):
+        state = super().getPartialState()
+        state["inclusive"] = self.isInclusif
+        return state
+
+    @classmethod
+    def fromPartialState(cls, state):
+        criterion = cls(state["name"], state["inclusive"], [], [],
+                ignoreIntegrity=True)
+        # The construction is not a use
+        criterion.nbUse = 0
+        criterion.mergePartialState(state)
+        return criterion
+
+    def mergePartialState(self, state):
+        """Merge the states by name, adding those never encountered"""
+        self.nbUse += state["nbUse"]
+
+        for subStateState in state["children"]:
+            subState = self.childrenByName.get(subStateState["name"])
+
+            if not subState :
+                subState = CriterionState(subStateState["name"])
+                self.addChild(subState)
+
+            subState.mergePartialState(subStateState)
+
 
 class Criteria(Element):
     tag = "Criteria"
@@ -703,11 +797,48 @@ class Criteria(Element):
             exported.addChild(child.export())
         return exported
 
+    def getStateKey(self):
+        """Return a hashable key of the current state of the criteria
+
+        Two criteria have the same key if and only if their exports are equal.
+        """
+        return tuple((child.name, tuple(self._getElementNames(child.currentState)))
+                for child in self.children)
+
+    @staticmethod
+    def getPartialStateKey(state):
+        """Return the key of the criteria a snapshot partial state was taken from
+
+        See getStateKey: in a snapshot, the children of a criterion are its
+        current states.
+        """
+        return tuple((criterionState["name"],
+                    tuple(subState["name"] for subState in criterionState["children"]))
+                for criterionState in state["children"])
+
     def addChild(self, child):
         if child in self.children:
             raise self.DuplicatedCriterionError(self, child)
         super().addChild(child)
 
+    @classmethod
+    def fromPartialState(cls, state):
+        criteria = cls(state["name"])
+        criteria.mergePartialState(state)
+        return criteria
+
+    def mergePartialState(self, state):
+        """Merge the criteria by name, adding those never encountered"""
+        self.nbUse += state["nbUse"]
+
+        for criterionState in state["children"]:
+            criterion = self.childrenByName.get(criterionState["name"])
+
+            if criterion :
+                criterion.mergePartialState(criterionState)
+            else :
+                self.addChild(Criterion.fromPartialState(criterionState))
+
 class ConfigAppliedWithoutCriteriaError(CustomError):
     def __init__(self, configurationName, domainName):
         self.configurationName = configurationName
@@ -716,9 +847,93 @@ class ConfigAppliedWithoutCriteriaError(CustomError):
         return ('Applying configuration "%s" from domain "%s" before declaring criteria' %
                 (self.configurationName, self.domainName))
 
+class UnsupportedLogCompressionError(CustomError):
+    def __init__(self, compression):
+        self.compression = compression
+
+    def __str__(self):
+        return ("Unable to decompress a %s compressed log: "
+                "the python module is not available" % self.compression)
+
+GZIP_MAGIC = b"\x1f\x8b"
+XZ_MAGIC = b"\xfd7zXZ\x00"
+
+class _PrefixedReader(io.RawIOBase):
+    """Raw binary stream returning some bytes, then the content of a buffered
+    binary file object"""
+
+    def __init__(self, prefix, bufferedFile):
+        self.prefix = prefix
+        self.bufferedFile = bufferedFile
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        if self.prefix:
+            data = self.prefix[:len(buffer)]
+            self.prefix = self.prefix[len(data):]
+        else:
+            data = self.bufferedFile.read1(len(buffer))
+
+        buffer[:len(data)] = data
+        return len(data)
+
+def readLogLines(logFile):
+    """Return an iterator over the lines of a log text file object
+
+    The log is read lazily so that it is never held in memory as a whole:
+    gzip and xz compressed logs are decompressed on the fly, other regular
+    files are memory-mapped and anything else (e.g. a pipe) is read line by
+    line. Newlines are universal, as for files opened in text mode: "\r\n"
+    and "\r" are translated to "\n".
+    """
+    binaryFile = logFile.buffer
+
+    # A peek may return fewer bytes than asked, e.g. on a pipe: read the
+    # magic number, then put it back in front of the log
+    magic = binaryFile.read(len(XZ_MAGIC))
+    if binaryFile.seekable():
+        binaryFile.seek(-len(magic), io.SEEK_CUR)
+    else:
+        binaryFile = io.BufferedReader(_PrefixedReader(magic, binaryFile))
+
+    if magic.startswith(GZIP_MAGIC):
+        return io.TextIOWrapper(gzip.GzipFile(fileobj=binaryFile),
+                encoding=logFile.encoding, errors=logFile.errors)
+
+    if magic.startswith(XZ_MAGIC):
+        if lzma is None:
+            raise UnsupportedLogCompressionError("xz")
+        return io.TextIOWrapper(lzma.LZMAFile(binaryFile),
+                encoding=logFile.encoding, errors=logFile.errors)
+
+    if binaryFile is not logFile.buffer:
+        # Not a regular file
+        return io.TextIOWrapper(binaryFile,
+                encoding=logFile.encoding, errors=logFile.errors)
+
+    try:
+        mappedLog = mmap.mmap(logFile.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError, io.UnsupportedOperation):
+        # Not a mappable file, e.g. an empty one
+        return iter(logFile)
+
+    return _readMappedLines(mappedLog, logFile.encoding, logFile.errors)
+
+def _readMappedLines(mappedLog, encoding, errors):
+    with mappedLog:
+        for line in iter(mappedLog.readline, b""):
+            if b"\r" in line:
+                # Same universal newlines translation as text files: a lone
+                # "\r" ends a line as well
+                line = line.replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+                for subLine in line.splitlines(True):
+                    yield subLine.decode(encoding, errors)
+            else:
+                yield line.decode(encoding, errors)
+
 class ParsePFWlog():
-    MATCH = "match"
-    ACTION = "action"
 
     class ChangeRequestOnUnknownCriterion(CustomError):
         def __init__(self, criterion):
@@ -734,32 +949,36 @@ class ParsePFWlog():
         self.criteria = criteria;
         self.ErrorsToIgnore = ErrorsToIgnore
 
-        configApplicationRegext = r""".*Applying configuration "(.*)" from domain "([^"]*)"""
-        matchConfigApplicationLine = re.compile(configApplicationRegext).match
+        # Lines containing none of these are not PFW lines; they are rejected
+        # without running any regex. "Criterion name: " is part of both the
+        # criterion creation and the criterion change lines.
+        self.lineMarkers = ('Applying configuration "', "Criterion name: ")
+
+        # A single regex classifies the remaining lines: the name of the
+        # outer group that matched tells the line type. The search is not
+        # anchored, so no leading ".*" is needed.
+        configApplicationRegext = r"""(?P<configApplication>Applying configuration "(?P<configurationName>.*)" from domain "(?P<domainName>[^"]*))"""
+
+        changingCriterionRegext = r"""(?P<changingCriterion>Selection criterion changed event: Criterion name: (?P<changedCriterionName>.*), current state: (?P<newCriterionState>[^\n\r]*))"""
 
         criterionCreationRegext = ", ".join([
-                    r""".*Criterion name: (.*)""",
-                    r"""type kind: (.*)""",
-                    r"""current state: (.*)""",
-                    r"""states: {(.*)}"""
+                    r"""(?P<criterionCreation>Criterion name: (?P<criterionName>.*)""",
+                    r"""type kind: (?P<criterionType>.*)""",
+                    r"""current state: (?P<currentCriterionState>.*)""",
+                    r"""states: {(?P<criterionStates>.*)})"""
                 ])
-        matchCriterionCreationLine = re.compile(criterionCreationRegext).match
-
-        changingCriterionRegext = r""".*Selection criterion changed event: Criterion name: (.*), current state: ([^\n\r]*)"""
-        matchChangingCriterionLine = re.compile(changingCriterionRegext).match
-
-        self.lineLogTypes = [
-                    {
-                        self.MATCH: matchConfigApplicationLine,
-                        self.ACTION: self._configApplication
-                    }, {
-                        self.MATCH: matchCriterionCreationLine,
-                        self.ACTION: self._criterionCreation
-                    }, {
-                        self.MATCH: matchChangingCriterionLine,
-                        self.ACTION: self._changingCriterion
-                    }
-                ]
+
+        self.searchLine = re.compile("|".join([
+                    configApplicationRegext,
+                    changingCriterionRegext,
+                    criterionCreationRegext
+                ])).search
+
+        self.lineActions = {
+                    "configApplication": self._configApplication,
+                    "criterionCreation": self._criterionCreation,
+                    "changingCriterion": self._changingCriterion
+                }
 
     @staticmethod
     def _formatCriterionList(liststring, separator):
@@ -770,7 +989,8 @@ class ParsePFWlog():
 
     def _criterionCreation(self, matchCriterionCreation):
         # Unpack
-        criterionName, criterionType, currentCriterionStates, criterionStates = matchCriterionCreation.group(1, 2, 3, 4)
+        criterionName, criterionType, currentCriterionStates, criterionStates = matchCriterionCreation.group(
+                "criterionName", "criterionType", "currentCriterionState", "criterionStates")
 
         criterionStateList = self._formatCriterionList(criterionStates, ", ")
 
@@ -802,7 +1022,8 @@ class ParsePFWlog():
 
     def _changingCriterion(self, matchChangingCriterion):
         # Unpack
-        criterionName, newCriterionSubStateNames = matchChangingCriterion.group(1, 2)
+        criterionName, newCriterionSubStateNames = matchChangingCriterion.group(
+                "changedCriterionName", "newCriterionState")
 
         newCriterionState = self._formatCriterionList(newCriterionSubStateNames, "|")
 
@@ -817,7 +1038,7 @@ class ParsePFWlog():
 
     def _configApplication(self, matchConfig):
         # Unpack
-        configurationName, domainName = matchConfig.group(1, 2)
+        configurationName, domainName = matchConfig.group("configurationName", "domainName")
 
         # Check that at least one criterion exist
         if not self.criteria.hasChildren() :
@@ -835,25 +1056,32 @@ class ParsePFWlog():
         self.domains.operationOnChild(path, usedOperation)
 
 
-    def _digest(self, lineLogType, lineLog):
+    def _digest(self, lineLog):
 
-        match = lineLogType[self.MATCH](lineLog)
+        for marker in self.lineMarkers:
+            if marker in lineLog:
+                break
+        else:
+            return False
+
+        match = self.searchLine(lineLog)
         if match :
-            lineLogType[self.ACTION](match)
+            self.lineActions[match.lastgroup](match)
             return True
         return False
 
 
     def parsePFWlog(self, lines):
-        for lineNb, lineLog in enumerate(lines, 1): # line number starts at 1
+        # Formatting debug messages is not free: check once
+        debug = logger.isEnabledFor(logging.DEBUG)
 
-            logger.debug("Parsing line :%s" % lineLog.rstrip())
+        for lineNb, lineLog in enumerate(lines, 1): # line number starts at 1
 
-            digested = (self._digest(lineLogType, lineLog)
-                    for lineLogType in self.lineLogTypes)
+            if debug:
+                logger.debug("Parsing line :%s" % lineLog.rstrip())
 
             try:
-                success = any(digested)
+                success = self._digest(lineLog)
 
             # Catch some exception in order to print the current parsing line,
             # then raise the exception again if not continue of error
@@ -869,7 +1097,7 @@ class ParsePFWlog():
                     logger.error('Ignoring exception:"%s", '
                                 'can not guarantee database integrity' % ex)
             else:
-                if not success:
+                if not success and debug:
                     logger.debug("Line does not match, dropped")
 
 
@@ -918,24 +1146,31 @@ class ArgumentParser:
                            "using default argument values:")
 
             logger.warning(" - InputFile: stdin")
-            self.inputFile = sys.stdin
+            self.logFileNames = ["-"]
+            self.partialStateFiles = []
+            self.jobs = 1
 
             logger.warning(" - OutputFile: stdout")
             self.outputFile = sys.stdout
 
             try:
-                self.domainsFile = sys.argv[1]
+                self.domainsFileName = sys.argv[1]
             except IndexError as ex:
                 logger.fatal("No domain file provided (first argument)")
                 raise ex
             else:
-                logger.warning(" - Domain file: " + self.domainsFile)
+                logger.warning(" - Domain file: " + self.domainsFileName)
+                self.domainsFile = open(self.domainsFileName)
 
             logger.warning(" - Output format: xml")
             self.XMLreport = True
+            self.partialStateReport = False
 
             logger.warning(" - Debug level: error")
             self.debugLevel = logging.ERROR
+
+            logger.warning(" - Ignored errors: none")
+            self.errorToIgnore = ()
         else :
 
             myArgParser = argparse.ArgumentParser(description='Generate PFW report')
@@ -946,9 +1181,24 @@ class ArgumentParser:
                         help="the PFW domain XML file"
                     )
             myArgParser.add_argument(
-                        'pfwlog', nargs='?',
-                        type=argparse.FileType('r'), default=sys.stdin,
-                        help="the PFW log file, default stdin"
+                        'pfwlogs', nargs='*', metavar='pfwlog',
+                        help="the PFW log files, each one from an independent PFW "
+                        "run, default stdin"
+                    )
+            myArgParser.add_argument(
+                        '-j', '--jobs',
+                        dest="jobs", default=1,
+                        type=int,
+                        help="number of processes parsing the log files in parallel, "
+                        "the report does not depend on it"
+                    )
+            myArgParser.add_argument(
+                        '--merge',
+                        dest="partialStateFiles", default=[],
+                        metavar="PARTIAL_STATE_FILE",
+                        action='append', type=argparse.FileType('r'),
+                        help="partial coverage state, as output with --partial, "
+                        "to add to the report; may be given several times"
                     )
             myArgParser.add_argument(
                         '-o', '--output',
@@ -977,6 +1227,13 @@ class ArgumentParser:
                         action='store_true',
                         help="raw coverage output report"
                     )
+            outputFormatGroupe.add_argument(
+                        '--partial',
+                        dest="partialFlag",
+                        action='store_true',
+                        help="partial coverage state output (JSON), "
+                        "to be merged later with --merge"
+                    )
 
             myArgParser.add_argument(
                         '--ignore-unknown-criterion',
@@ -1004,12 +1261,20 @@ class ArgumentParser:
             options = myArgParser.parse_args()
 
             # Mapping to attributes
-            self.inputFile = options.pfwlog
+            self.partialStateFiles = options.partialStateFiles
             self.outputFile = options.outputFile
             self.domainsFile = options.domainsFile
+            self.domainsFileName = options.domainsFile.name
+            self.jobs = max(options.jobs, 1)
+
+            # Only read stdin if there is nothing else to report on
+            self.logFileNames = options.pfwlogs
+            if not self.logFileNames and not self.partialStateFiles:
+                self.logFileNames = ["-"]
 
             # Output report in xml if flag not set
             self.XMLreport = not options.rawFlag
+            self.partialStateReport = options.partialFlag
 
             # Setting logger level
             levelCapped = min(options.debugLevel, len(self.levelTranslate) - 1)
@@ -1030,6 +1295,40 @@ class ArgumentParser:
 
 
 
+def parseLogFile(root, logFileName, errorToIgnore):
+    """Parse a PFW log file ("-" for stdin) into a coverage tree"""
+    parser = ParsePFWlog(root.domains, root.criteria, errorToIgnore)
+
+    if logFileName == "-":
+        parser.parsePFWlog(readLogLines(sys.stdin))
+    else:
+        with open(logFileName) as logFile:
+            parser.parsePFWlog(readLogLines(logFile))
+
+# Domain file of the worker processes, parsed once per worker
+workerDom = None
+
+def initWorker(domainsFileName, debugLevel):
+    global workerDom
+    logger.setLevel(debugLevel)
+    workerDom = xml.dom.minidom.parse(domainsFileName)
+
+def computePartialState(job):
+    """Parse a PFW log file into a coverage tree of its own
+
+    'job' is a (log file name, errors to ignore) tuple. Return a (partial
+    state, error message) tuple, one of them being None.
+    """
+    logFileName, errorToIgnore = job
+
+    root = Root("DomainCoverage", workerDom)
+    try:
+        parseLogFile(root, logFileName, errorToIgnore)
+    except CustomError as ex:
+        return None, "Error during parsing log file %s: %s" % (logFileName, ex)
+
+    return root.getPartialState(), None
+
 def main():
 
     errorDuringLogParsing = -1
@@ -1053,20 +1352,63 @@ def main():
     # Create element tree
     root = Root("DomainCoverage", dom)
 
+    logFileNames = commandLineArguments.logFileNames
+    errorToIgnore = commandLineArguments.errorToIgnore
+
     # Parse PFW events
-    parser = ParsePFWlog(root.domains, root.criteria, commandLineArguments.errorToIgnore)
+    if len(logFileNames) == 1 and not commandLineArguments.partialStateFiles:
+        try:
+            parseLogFile(root, logFileNames[0], errorToIgnore)
+        except CustomError as ex:
+            logger.fatal("Error during parsing log file %s: %s" %
+                (logFileNames[0], ex))
+            sys.exit(errorDuringLogParsing)
+    else:
+        # Each log file is parsed into a tree of its own, whose counters are
+        # then added to the report tree, in the command line order
+        try:
+            for partialStateFile in commandLineArguments.partialStateFiles:
+                root.mergePartialState(json.load(partialStateFile))
+        except (ValueError, KeyError, TypeError, CustomError) as ex:
+            logger.fatal("Error during merging partial state file %s: %s" %
+                (partialStateFile.name, ex))
+            sys.exit(errorDuringLogParsing)
+
+        jobs = [(logFileName, errorToIgnore) for logFileName in logFileNames]
+        workerArgs = (commandLineArguments.domainsFileName,
+                commandLineArguments.debugLevel)
+
+        if commandLineArguments.jobs > 1 and len(jobs) > 1:
+            pool = multiprocessing.Pool(min(commandLineArguments.jobs, len(jobs)),
+                    initWorker, workerArgs)
+            results = pool.imap(computePartialState, jobs)
+        else:
+            pool = None
+            initWorker(*workerArgs)
+            results = map(computePartialState, jobs)
 
-    try:
-        parser.parsePFWlog(commandLineArguments.inputFile.readlines())
-    except CustomError as ex:
-        logger.fatal("Error during parsing log file %s: %s" %
-            (commandLineArguments.inputFile, ex))
-        sys.exit(errorDuringLogParsing)
+        for partialState, error in results:
+            if error is not None:
+                logger.fatal(error)
+                sys.exit(errorDuringLogParsing)
+
+            try:
+                root.mergePartialState(partialState)
+            except CustomError as ex:
+                logger.fatal(str(ex))
+                sys.exit(errorDuringLogParsing)
+
+        if pool:
+            pool.close()
+            pool.join()
 
     # Output report
     outputFile = commandLineArguments.outputFile
 
-    if not commandLineArguments.XMLreport :
+    if commandLineArguments.partialStateReport :
+        json.dump(root.getPartialState(), outputFile)
+        outputFile.write("\n")
+    elif not commandLineArguments.XMLreport :
         outputFile.write("%s\n" % root.dump(withCoverage=True, withNbUse=True))
     else :
         outputFile.write(root.exportToXML().toprettyxml())
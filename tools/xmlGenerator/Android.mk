@@ -40,6 +40,17 @@ LOCAL_MODULE_CLASS := EXECUTABLES
 LOCAL_IS_HOST_MODULE := true
 include $(BUILD_PREBUILT)
 
+include $(CLEAR_VARS)
+LOCAL_MODULE := EddCache.py
+LOCAL_MODULE_OWNER := intel
+LOCAL_SRC_FILES := $(LOCAL_MODULE)
+LOCAL_MODULE_CLASS := EXECUTABLES
+LOCAL_IS_HOST_MODULE := true
+LOCAL_REQUIRED_MODULES := \
+    PfwBaseTranslator.py \
+    EddParser.py
+include $(BUILD_PREBUILT)
+
 include $(CLEAR_VARS)
 LOCAL_MODULE := PfwBaseTranslator.py
 LOCAL_MODULE_OWNER := intel
@@ -56,7 +67,16 @@ LOCAL_MODULE_CLASS := EXECUTABLES
 LOCAL_IS_HOST_MODULE := true
 LOCAL_REQUIRED_MODULES := \
     PfwBaseTranslator.py \
-    EddParser.py
+    EddParser.py \
+    EddCache.py
+include $(BUILD_PREBUILT)
+
+include $(CLEAR_VARS)
+LOCAL_MODULE := SettingsManifest.py
+LOCAL_MODULE_OWNER := intel
+LOCAL_SRC_FILES := $(LOCAL_MODULE)
+LOCAL_MODULE_CLASS := EXECUTABLES
+LOCAL_IS_HOST_MODULE := true
 include $(BUILD_PREBUILT)
 
 include $(CLEAR_VARS)
@@ -76,6 +96,8 @@ LOCAL_IS_HOST_MODULE := true
 LOCAL_REQUIRED_MODULES := \
     _PyPfw_32 \
     EddParser.py \
+    EddCache.py \
+    SettingsManifest.py \
     PfwBaseTranslator.py \
     hostConfig.py
 include $(BUILD_PREBUILT)
@@ -0,0 +1,125 @@
+# Copyright (c) 2015, Intel Corporation
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification,
+# are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation and/or
+# other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR
+# ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON
+# ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""On-disk cache of translated EDD files
+
+Each EDD file is stored as the recording of the translator calls its parsed,
+propagated tree produces, in JSON. Entries are keyed by the EDD file content and
+by the version of the generator, so that a modified file or an updated parser
+never hits a stale entry."""
+
+import EddParser
+import PfwBaseTranslator
+
+import hashlib
+import json
+import os
+import sys
+import tempfile
+
+# To be incremented each time the layout of a cache entry changes
+CACHE_FORMAT_VERSION = 2
+
+# EDD files are not necessarily UTF-8: their strings are stored as Latin-1,
+# which maps each byte to a character and back
+ENCODING = "latin-1"
+
+def getSourceFile(module):
+    source = os.path.splitext(module.__file__)[0] + ".py"
+    if not os.path.exists(source):
+        source = module.__file__
+    return source
+
+def getGeneratorVersion():
+    """Return a digest identifying the code the cached translations depend on
+
+    That is the EDD parser producing them, the recording translator and the
+    layout of the entries."""
+    digest = hashlib.sha1(str(CACHE_FORMAT_VERSION))
+    for module in [EddParser, PfwBaseTranslator, sys.modules[__name__]]:
+        with open(getSourceFile(module), 'rb') as sourceFile:
+            digest.update(sourceFile.read())
+    return digest.hexdigest()
+
+def fromJson(value):
+    """Turn the unicode strings of a loaded JSON value back into strings"""
+    if isinstance(value, unicode):
+        return value.encode(ENCODING)
+    if isinstance(value, list):
+        return [fromJson(item) for item in value]
+    return value
+
+class EddCache(object):
+    """Store and retrieve EDD translations in a cache directory"""
+
+    suffix = ".edd-cache"
+
+    def __init__(self, directory):
+        self._directory = directory
+        self._generatorVersion = getGeneratorVersion()
+
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+    def _getEntryPath(self, content):
+        digest = hashlib.sha1(self._generatorVersion)
+        digest.update(content)
+        return os.path.join(self._directory, digest.hexdigest() + self.suffix)
+
+    def load(self, content):
+        """Return the PfwRecordingTranslator stored for an EDD file content
+
+        Return None if there is no such entry or if it is unreadable."""
+        try:
+            with open(self._getEntryPath(content), 'rb') as entry:
+                commands = fromJson(json.load(entry))
+        except (IOError, ValueError):
+            return None
+
+        # Each command is a (method name, arguments) pair
+        if not isinstance(commands, list) or not all(
+                isinstance(command, list) and len(command) == 2
+                and isinstance(command[0], str) and isinstance(command[1], list)
+                for command in commands):
+            return None
+
+        return PfwBaseTranslator.PfwRecordingTranslator(
+                [(method, tuple(args)) for method, args in commands])
+
+    def store(self, content, recording):
+        """Store the PfwRecordingTranslator of an EDD file content"""
+        # Write to a temporary file first so that a concurrent generator never
+        # reads a partial entry
+        fd, tmpPath = tempfile.mkstemp(dir=self._directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as entry:
+                json.dump(recording.getCommands(), entry, encoding=ENCODING)
+            os.rename(tmpPath, self._getEntryPath(content))
+        except:
+            os.remove(tmpPath)
+            raise
@@ -34,18 +34,45 @@
 import re
 import sys
 import copy
+import gc
+import struct
+from array import array
 from itertools import izip
-from itertools import imap
 
 # =====================================================================
 """ Context classes, used during propagation and the "to PFW script" step """
 # =====================================================================
 
-class PropagationContextItem(list) :
-    """Handle an item during the propagation step"""
-    def __copy__(self):
-        """C.__copy__() -> a shallow copy of C"""
-        return self.__class__(self)
+class PropagationContextItem(object) :
+    """Handle an item during the propagation step
+
+    The items of a context are stored in persistent linked lists, each node
+    being an (item, previous node) tuple. As appending an item never modifies
+    existing nodes, a context and all its copies can share them.
+
+    An instance of this class is a view on one of these lists."""
+    def __init__(self, nodes, key):
+        self._nodes = nodes
+        self._key = key
+
+    def __iter__(self):
+        items = []
+        node = self._nodes[self._key]
+        while node is not None :
+            items.append(node[0])
+            node = node[1]
+        return reversed(items)
+
+    def __iadd__(self, items):
+        self.extend(items)
+        return self
+
+    def append(self, item):
+        self._nodes[self._key] = (item, self._nodes[self._key])
+
+    def extend(self, items):
+        for item in items :
+            self.append(item)
 
 class PropagationContextElement(PropagationContextItem) :
     """Handle an Element during the propagation step"""
@@ -57,6 +84,98 @@ class PropagationContextElement(PropagationContextItem) :
         return matchingElements
 
 
+class PropagationContextIndex(object) :
+    """Immutable index by name of the elements of a persistent linked list
+
+    Adding an element returns a new index which shares all but O(log n) of
+    its structure with the original one, so that each node of a list keeps
+    the index of the elements up to it, whichever branch it belongs to.
+
+    The index is a hash array mapped trie: inner nodes are lists of
+    2 ** bits children, leaves are (hash, ((name, elements), ...)) tuples,
+    elements being an (element, previous elements) linked list, last first."""
+    __slots__ = ["root"]
+
+    bits = 4
+    mask = (1 << bits) - 1
+
+    def __init__(self, root=None) :
+        self.root = root
+
+    def add(self, element):
+        """return a new index with element appended to those of its name"""
+        name = element.getName()
+        nameHash = hash(name)
+        elements = (element, self._get(name, nameHash))
+        return self.__class__(self._set(self.root, 0, nameHash, name, elements))
+
+    def getElementsFromName(self, name):
+        """return the elements of a name, in list order"""
+        matchingElements = []
+        elements = self._get(name, hash(name))
+        while elements is not None :
+            matchingElements.append(elements[0])
+            elements = elements[1]
+        matchingElements.reverse()
+        return matchingElements
+
+    def _get(self, name, nameHash):
+        node = self.root
+        shift = 0
+        while type(node) is list :
+            node = node[(nameHash >> shift) & self.mask]
+            shift += self.bits
+
+        if node is not None and node[0] == nameHash :
+            for leafName, elements in node[1] :
+                if leafName == name :
+                    return elements
+        return None
+
+    def _set(self, node, shift, nameHash, name, elements):
+        if node is None :
+            return (nameHash, ((name, elements),))
+
+        if type(node) is list :
+            slot = (nameHash >> shift) & self.mask
+            node = list(node)
+            node[slot] = self._set(node[slot], shift + self.bits, nameHash, name, elements)
+            return node
+
+        if node[0] == nameHash :
+            # same hash: replace or add the name in the leaf
+            pairs = tuple(pair for pair in node[1] if pair[0] != name)
+            return (nameHash, pairs + ((name, elements),))
+
+        # different hashes: split the leaf
+        inner = [None] * (self.mask + 1)
+        inner[(node[0] >> shift) & self.mask] = node
+        return self._set(inner, shift, nameHash, name, elements)
+
+
+class PropagationContextIndexedElement(PropagationContextElement) :
+    """Handle an Element during the propagation step, indexed by name
+
+    Nodes are (item, previous node, index) tuples, index being the
+    PropagationContextIndex of the list ending with this node. Elements are
+    indexed by the name they have when appended."""
+    def append(self, item):
+        previous = self._nodes[self._key]
+        if previous == None :
+            index = PropagationContextIndex()
+        else :
+            index = previous[2]
+
+        self._nodes[self._key] = (item, previous, index.add(item))
+
+    def getElementsFromName(self, name):
+        node = self._nodes[self._key]
+        if node == None :
+            return []
+
+        return node[2].getElementsFromName(name)
+
+
 class PropagationContextOption(PropagationContextItem) :
     """Handle an Option during the propagation step"""
     def getOptionItems (self, itemName):
@@ -67,75 +186,90 @@ class PropagationContextOption(PropagationContextItem) :
 
 
 class PropagationContext() :
-    """Handle the context during the propagation step"""
+    """Handle the context during the propagation step
+
+    Copying a context is done in constant time: the copy shares the item
+    lists of the original context until either of them appends to it."""
     def __init__(self, propagationContext=None) :
 
         if propagationContext == None :
+            # map each list name to its last node, None for an empty list
             self._context = {
-                "DomainOptions" : PropagationContextOption() ,
-                "Configurations" : PropagationContextElement() ,
-                "ConfigurationOptions" : PropagationContextOption() ,
-                "Rules" : PropagationContextElement() ,
-                "PathOptions" : PropagationContextOption() ,
+                "DomainOptions" : None ,
+                "Configurations" : None ,
+                "ConfigurationOptions" : None ,
+                "Rules" : None ,
+                "PathOptions" : None ,
         }
         else :
             self._context = propagationContext
 
     def copy(self):
         """return a copy of the context"""
-        contextCopy = self._context.copy()
-
-        for key in iter(self._context) :
-            contextCopy[key] = contextCopy[key].__copy__()
-
-        return self.__class__(contextCopy)
+        return self.__class__(self._context.copy())
 
     def getDomainOptions (self):
-        return self._context["DomainOptions"]
+        return PropagationContextOption(self._context, "DomainOptions")
 
     def getConfigurations (self):
-        return self._context["Configurations"]
+        return PropagationContextIndexedElement(self._context, "Configurations")
 
     def getConfigurationOptions (self):
-        return self._context["ConfigurationOptions"]
+        return PropagationContextOption(self._context, "ConfigurationOptions")
 
     def getRules (self):
-        return self._context["Rules"]
+        return PropagationContextElement(self._context, "Rules")
 
     def getPathOptions (self):
-        return self._context["PathOptions"]
+        return PropagationContextOption(self._context, "PathOptions")
 
 
 # =====================================================
 """Element option container"""
 # =====================================================
 
-class Options () :
-    """handle element options"""
-    def __init__(self, options=[], optionNames=[]) :
-        self.options = dict(izip(optionNames, options))
-        # print(options,optionNames,self.options)
+class Options (object) :
+    """handle element options
+
+    Option values are stored in a tuple aligned with the option names of the
+    element class; trailing options that were not given are left out. Only
+    these names can be set."""
+    __slots__ = ["names", "values"]
 
+    def __init__(self, options=(), optionNames=[]) :
+        self.names = optionNames
+        self.values = tuple(options[:len(optionNames)])
 
     def __str__(self) :
         ops2str = []
-        for name, argument in self.options.items() :
+        for name, argument in izip(self.names, self.values) :
             ops2str.append(str(name) + "=\"" + str(argument) + "\"")
 
         return " ".join(ops2str)
 
     def getOption(self, name):
         """get option by its name, if it does not exist return empty string"""
-        return self.options.get(name, "")
+        try :
+            return self.values[self.names.index(name)]
+        except (ValueError, IndexError) :
+            return ""
 
     def setOption(self, name, newOption):
-        """set option by its name"""
-        self.options[name] = newOption
+        """set option by its name, raise ValueError if it is not a known name"""
+        try :
+            index = self.names.index(name)
+        except ValueError :
+            raise ValueError("unknown option \"%s\", expected one of: %s" %
+                    (name, ", ".join(self.names)))
+
+        values = self.values + ("",) * (index + 1 - len(self.values))
+        self.values = values[:index] + (newOption,) + values[index + 1:]
 
     def copy (self):
         """D.copy() -> a shallow copy of D"""
-        copy = Options()
-        copy.options = self.options.copy()
+        # values are immutable and can thus be shared
+        copy = Options((), self.names)
+        copy.values = self.values
         return copy
 
 # ====================================================
@@ -146,19 +280,24 @@ class Element(object):
     """ implement a basic element
 
     It is the class base for all other elements as Domain, Configuration..."""
+    __slots__ = ["option", "children"]
+
     tag = "unknown"
     optionNames = ["Name"]
     childWhiteList = []
     optionDelimiter = " "
 
+    # shared by all elements without children, in place of an empty list each
+    noChildren = ()
+
     def __init__(self, line=None) :
 
         if line == None :
-            self.option = Options([], self.optionNames)
+            self.option = Options((), self.optionNames)
         else :
             self.option = self.optionFromLine(line)
 
-        self.children = []
+        self.children = self.noChildren
 
     def optionFromLine(self, line) :
         # get ride of spaces
@@ -176,7 +315,7 @@ class Element(object):
         options = line.split(self.optionDelimiter, len(self.optionNames) - 1)
 
         # get ride of leftover spaces
-        optionsStrip = list(imap(str.strip, options))
+        optionsStrip = [option.strip() for option in options]
 
         return optionsStrip
 
@@ -187,6 +326,9 @@ class Element(object):
             self.childWhiteList.index(child.__class__.__name__)
             # If no exception was raised, add child to child list
 
+            if self.children is self.noChildren :
+                self.children = []
+
             if append :
                 self.children.append(child)
             else :
@@ -198,6 +340,9 @@ class Element(object):
 
     def addChildren(self, children, append=True) :
         """Add a list of child"""
+        if self.children is self.noChildren :
+            self.children = []
+
         if append:
             # Add children at the end of the child list
             self.children.extend(children)
@@ -205,18 +350,27 @@ class Element(object):
             # Add children at the begining of the child list
             self.children = children + self.children
 
-    def childrenToString(self, prefix=""):
-        """return raw printed children """
-        body = ""
+    def iterRawLines(self, prefix=""):
+        """yield the raw printed element, line by line
+
+        Lines are yielded as they are built, so that a raw dump can be
+        written without being held in memory."""
+        yield prefix + " " + self.tag + " " + str(self.option) + "\n"
+
+        childPrefix = prefix + "\t"
         for child in self.children :
-            body = body + child.__str__(prefix)
+            for line in child.iterRawLines(childPrefix) :
+                yield line
 
-        return body
+    def childrenToString(self, prefix=""):
+        """return raw printed children """
+        return "".join([line
+                for child in self.children
+                for line in child.iterRawLines(prefix)])
 
     def __str__(self, prefix="") :
         """return raw printed element"""
-        selfToString = prefix + " " + self.tag + " " + str(self.option)
-        return selfToString + "\n" + self.childrenToString(prefix + "\t")
+        return "".join(self.iterRawLines(prefix))
 
     def extractChildrenByClass(self, classTypeList) :
         """return all children whose class is in the list argument
@@ -251,6 +405,8 @@ class Element(object):
 
 class ElementWithTag (Element):
     """Element of this class are declared with a tag  => line == "tag: .*" """
+    __slots__ = []
+
     def extractOptions(self, line) :
         lineWithoutTag = line.split(":", 1)[-1].strip()
         options = super(ElementWithTag, self).extractOptions(lineWithoutTag)
@@ -259,6 +415,8 @@ class ElementWithTag (Element):
 # ----------------------------------------------------------
 
 class ElementWithInheritance(Element):
+    __slots__ = []
+
     def propagate (self, context=PropagationContext) :
         """propagate some proprieties to children"""
 
@@ -275,6 +433,8 @@ class ElementWithInheritance(Element):
 
 class ElementWithRuleInheritance(ElementWithInheritance):
     """class that will give to its children its rules"""
+    __slots__ = []
+
     def ruleInheritance(self, context):
         """Add its rules to the context and get context rules"""
 
@@ -285,7 +445,7 @@ class ElementWithRuleInheritance(ElementWithInheritance):
         contextRules = context.getRules()
 
         # adopt rules of the beginning of the context
-        self.addChildren(contextRules, append=False)
+        self.addChildren(list(contextRules), append=False)
 
         # add previously extract rules to the context
         contextRules += childRules
@@ -297,6 +457,7 @@ class EmptyLine (Element) :
     """This class represents an empty line.
 
     Will raise "EmptyLineWarning" exception at instanciation."""
+    __slots__ = []
 
     tag = "emptyLine"
     match = re.compile(r"[ \t]*\n?$").match
@@ -309,6 +470,7 @@ class Commentary(Element):
     """This class represents a commentary.
 
     Will raise "CommentWarning" exception at instanciation."""
+    __slots__ = []
 
     tag = "commentary"
     optionNames = ["comment"]
@@ -320,6 +482,8 @@ class Commentary(Element):
 
 class Path (ElementWithInheritance) :
     """class implementing the "path = value" concept"""
+    __slots__ = []
+
     tag = "path"
     optionNames = ["Name", "value"]
     match = re.compile(r".+=").match
@@ -328,6 +492,10 @@ class Path (ElementWithInheritance) :
     def translate(self, translator):
         translator.setParameter(self.getName(), self.option.getOption("value"))
 
+    def getParameters (self) :
+        """return the (path name, value) list of the path"""
+        return [(self.getName(), self.option.getOption("value"))]
+
     def Inheritance (self, context) :
         """check for path name inheritance"""
         self.OptionsInheritance(context)
@@ -340,6 +508,8 @@ class Path (ElementWithInheritance) :
 
 
 class GroupPath (Path, ElementWithTag) :
+    __slots__ = []
+
     tag = "component"
     match = re.compile(tag + r" *:").match
     optionNames = ["Name"]
@@ -360,6 +530,15 @@ class GroupPath (Path, ElementWithTag) :
 
         return pathNames
 
+    def getParameters (self) :
+        """return the (path name, value) list of all path descendants"""
+
+        parameters = []
+        for child in self.extractChildrenByClass([Path, GroupPath]):
+            parameters += child.getParameters()
+
+        return parameters
+
     def translate(self, translator):
         for child in self.extractChildrenByClass([Path, GroupPath]):
             child.translate(translator)
@@ -372,13 +551,35 @@ class Rule (Element) :
     A rule is composed of a criterion, a rule type and an criterion state.
     It should not have any child and is propagated to all configuration in parent descendants.
     """
+    __slots__ = ["formattedSyntax"]
 
     tag = "rule"
     optionNames = ["criterion", "type", "element"]
     match = re.compile(r"[a-zA-Z0-9_.]+ +(Is|IsNot|Includes|Excludes) +[a-zA-Z0-9_.]+").match
     childWhiteList = []
 
+    def __init__(self, line=None) :
+        super(Rule, self).__init__(line)
+
+        # (prefix, syntax) of the last PFWSyntax call, see PFWSyntax
+        self.formattedSyntax = None
+
     def PFWSyntax (self, prefix=""):
+        """return the pfw syntax of the rule, memoized
+
+        Once propagated, a rule is shared by all configurations inheriting it,
+        so its syntax is formatted once instead of once per configuration.
+        Rules must not be modified after their syntax has been asked for."""
+
+        formattedSyntax = self.formattedSyntax
+        if formattedSyntax is not None and formattedSyntax[0] == prefix :
+            return formattedSyntax[1]
+
+        script = self.formatSyntax(prefix)
+        self.formattedSyntax = (prefix, script)
+        return script
+
+    def formatSyntax (self, prefix):
 
         script = prefix + \
                     self.option.getOption("criterion") + " " + \
@@ -395,6 +596,7 @@ class Operator (Rule) :
     It is as rules propagated to all configuration children in parent descendants.
     It should only have the name ANY or ALL to be understood by PFW.
     """
+    __slots__ = []
 
     tag = "operator"
     optionNames = ["Name"]
@@ -403,7 +605,7 @@ class Operator (Rule) :
 
     syntax = { "ANY" : "Any" , "ALL" : "All"}
 
-    def PFWSyntax (self, prefix=""):
+    def formatSyntax (self, prefix):
         """ return a pfw rule (ex : "Any{criterion1 is state1}") generated from "self" and its children options"""
         script = ""
 
@@ -425,11 +627,19 @@ class Operator (Rule) :
 # ----------------------------------------------------------
 
 class Configuration (ElementWithRuleInheritance, ElementWithTag) :
+    __slots__ = ["configurableElements"]
+
     tag = "configuration"
     optionNames = ["Name"]
     match = re.compile(r"conf *:").match
     childWhiteList = ["Rule", "Operator", "Path", "GroupPath"]
 
+    def __init__(self, line=None) :
+        super(Configuration, self).__init__(line)
+
+        # path names of the configuration, see cacheConfigurableElements
+        self.configurableElements = None
+
     def composition (self, context):
         """make all needed composition
 
@@ -485,14 +695,39 @@ class Configuration (ElementWithRuleInheritance, ElementWithTag) :
     def getConfigurableElements (self) :
         """return all path name defined in this configuration"""
 
+        if self.configurableElements != None :
+            return self.configurableElements
+
         return self.getRootPath().getPathNames()
 
-    def getRuleString(self):
-        """Output this configuration's rule as a string"""
+    def cacheConfigurableElements (self) :
+        """compute and keep the configuration path names
+
+        Path names are only complete once the configuration is propagated."""
+
+        self.configurableElements = None
+        self.configurableElements = self.getConfigurableElements()
+        return self.configurableElements
+
+    def getRuleString(self, ruleTable=None):
+        """Output this configuration's rule as a string
+
+        If a 'ruleTable' dictionary is given, the rule strings are shared
+        through it by all configurations having the same rule children."""
 
         # Create a rootRule
         ruleChildren = self.extractChildrenByClass([Rule, Operator])
 
+        if ruleTable is not None :
+            # rules are compared by identity: inherited rules are shared
+            key = tuple(ruleChildren)
+            try :
+                return ruleTable[key]
+            except KeyError :
+                ruleString = self.getRuleString()
+                ruleTable[key] = ruleString
+                return ruleString
+
         # Do not create a root rule if there is only one fist level Operator rule
         if len(ruleChildren) == 1 and ruleChildren[0].__class__ == Operator :
             ruleroot = ruleChildren[0]
@@ -504,14 +739,12 @@ class Configuration (ElementWithRuleInheritance, ElementWithTag) :
 
         return ruleroot.PFWSyntax()
 
-    def translate(self, translator):
+    def translate(self, translator, ruleTable=None):
         translator.createConfiguration(self.getName())
-        translator.setRule(self.getRuleString())
+        translator.setRule(self.getRuleString(ruleTable))
 
-        paths = self.extractChildrenByClass([Path, GroupPath])
         translator.setElementSequence(self.getConfigurableElements())
-        for path in paths:
-            path.translate(translator)
+        translator.setParameters(self.getRootPath().getParameters())
 
     def copy (self) :
         """return a shallow copy of the configuration"""
@@ -528,6 +761,8 @@ class Configuration (ElementWithRuleInheritance, ElementWithTag) :
         return confCopy
 
 class GroupConfiguration (Configuration) :
+    __slots__ = []
+
     tag = "GroupConfiguration"
     optionNames = ["Name"]
     match = re.compile(r"(supConf|confGroup|confType) *:").match
@@ -567,13 +802,24 @@ class GroupConfiguration (Configuration) :
 
         return configurableElements
 
-    def translate(self, translator):
+    def getConfigurations (self) :
+        """return all configurations of the group, in getConfigurableElements order"""
+        configurations = self.extractChildrenByClass([Configuration])
+
+        for groupConfiguration in self.extractChildrenByClass([GroupConfiguration]) :
+            configurations += groupConfiguration.getConfigurations()
+
+        return configurations
+
+    def translate(self, translator, ruleTable=None):
         for child in self.extractChildrenByClass([Configuration, GroupConfiguration]):
-            child.translate(translator)
+            child.translate(translator, ruleTable)
 
 # ----------------------------------------------------------
 
 class Domain (ElementWithRuleInheritance, ElementWithTag) :
+    __slots__ = []
+
     tag = "domain"
     sequenceAwareKeyword = "sequenceAware"
 
@@ -650,25 +896,26 @@ class Domain (ElementWithRuleInheritance, ElementWithTag) :
     def checkConfigurableElementUnicity (self):
         """ check that all configurable elements defined in child configuration are the sames"""
 
-        # get a list. Each elements of is the configurable element list of a configuration
-        configurableElementsList = self.getRootConfiguration().getConfigurableElements()
+        firstConfigurableElements = None
 
-        # if at least two configurations in the domain
-        if len(configurableElementsList) > 1 :
+        for configuration in self.getRootConfiguration().getConfigurations() :
+            # configurations are propagated: their path names are now final and
+            # kept for the translation
+            configurableElements = configuration.cacheConfigurableElements()
 
-            # get first configuration configurable element list sort
-            configurableElementsList0 = list(configurableElementsList[0])
-            configurableElementsList0.sort()
+            # compare path names regardless of their order
+            comparable = frozenset(configurableElements)
+            if len(comparable) != len(configurableElements) :
+                # a path name is repeated, it has to be counted
+                comparable = tuple(sorted(configurableElements))
 
-            for configurableElements in configurableElementsList :
-                # sort current configurable element list
-                auxConfigurableElements = list(configurableElements)
-                auxConfigurableElements.sort()
+            if firstConfigurableElements == None :
+                firstConfigurableElements = comparable
 
-                if auxConfigurableElements != configurableElementsList0 :
-                    # if different, 2 configurations those not have the same configurable element list
-                    # => one or more configurable element is missing in one of the 2 configuration
-                    raise UndefinedParameter(self.getName())
+            elif comparable != firstConfigurableElements :
+                # if different, 2 configurations those not have the same configurable element list
+                # => one or more configurable element is missing in one of the 2 configuration
+                raise UndefinedParameter(self.getName())
 
 
     def translate(self, translator):
@@ -680,12 +927,14 @@ class Domain (ElementWithRuleInheritance, ElementWithTag) :
 
         # add configurable elements
         if len(configurableElementsList) != 0 :
-            for configurableElement in configurableElementsList[0] :
-                translator.addElement(configurableElement)
+            translator.addElements(configurableElementsList[0])
 
-        configurations.translate(translator)
+        # configurations of a domain mostly share their rules
+        configurations.translate(translator, {})
 
 class GroupDomain (Domain) :
+    __slots__ = []
+
     tag = "groupDomain"
     match = re.compile(r"(supDomain|domainGroup) *:").match
     childWhiteList = ["GroupDomain", "Domain", "GroupConfiguration", "Rule", "Operator"]
@@ -697,6 +946,8 @@ class GroupDomain (Domain) :
 # ----------------------------------------------------------
 
 class Root(Element):
+    __slots__ = []
+
     tag = "root"
     childWhiteList = ["Domain", "GroupDomain"]
 
@@ -771,6 +1022,9 @@ class UnknownElementTypeError(MySyntaxError):
 class SpaceInIndentationError(MySyntaxError):
     comment = " error in ,%(line)s space is not permited in indentation"
 
+class PrecompiledFormatError(MySyntaxError):
+    comment = " error in precompiled EDD, %(line)s"
+
 
 # ============================================
 """Class creating the DOM elements from a stream"""
@@ -796,6 +1050,20 @@ class ElementsFactory(object)  :
         GroupPath
         ]
 
+        # Join all element patterns, in the same order, into a single
+        # alternation: the first alternative matching a line is the one the
+        # sequential tests would have elected, and its group name gives the
+        # element class to instanciate.
+        self.elementFromGroup = {}
+        patterns = []
+        for element in self.elementClass :
+            groupName = element.__name__
+            self.elementFromGroup[groupName] = element
+            # element.match is the bound match method of a compiled pattern
+            patterns.append("(?P<%s>%s)" % (groupName, element.match.__self__.pattern))
+
+        self.elementMatch = re.compile("|".join(patterns)).match
+
     def createElementFromLine (self, line) :
         """return an instance of the first matching element
 
@@ -803,10 +1071,9 @@ class ElementsFactory(object)  :
         The method match is called with the argument line.
         Raise UnknownElementTypeError if no element matched.
         """
-        for element in self.elementClass :
-            if element.match(line) :
-                # print (line + element.__class__.__name__)
-                return element(line)
+        match = self.elementMatch(line)
+        if match :
+            return self.elementFromGroup[match.lastgroup](line)
         # if we have not find any
         raise UnknownElementTypeError(line)
 
@@ -865,8 +1132,20 @@ the rest is the rest of the line."""
     def parse(self, stream, verbose=False):
         """parse a stream, usually a opened file"""
         myroot = Root("root")
+        myroot.addChildren(list(self.parseElements(stream, verbose)))
+
+        return myroot
+
+    def parseElements(self, stream, verbose=False):
+        """parse a stream and yield each top level element once complete
+
+        A top level element is complete when the next one starts or at the end
+        of the stream. Complete elements are not referenced by the parser any
+        more, so that a stream can be processed one top level element at a
+        time."""
+        myroot = Root("root")
         context = [myroot]  # root is element of rank 0
-        warnings = ""
+        topLevelElement = None
 
         for num, line in enumerate(stream):
             try:
@@ -881,10 +1160,189 @@ the rest is the rest of the line."""
                 ex.setLine(line, num + 1)
                 if verbose :
                     print >>sys.stderr, ex
+                continue
 
             except MySyntaxError, ex :
                 ex.setLine(line, num + 1)
                 raise
 
-        return myroot
+            if rank == 1 :
+                # the previous top level element is complete
+                myroot.children = myroot.noChildren
+                if topLevelElement != None :
+                    yield topLevelElement
+                topLevelElement = myelement
+
+        if topLevelElement != None :
+            yield topLevelElement
+
+
+# ============================================
+"""Precompiled EDD format"""
+# ============================================
+
+class PrecompiledFormat(object) :
+    """Binary serialization of propagated trees
+
+    A precompiled EDD is a header followed by a string table and by a flat
+    array of unsigned 32 bits integers describing the nodes. Nodes are
+    written children first, so that a node only refers to previous ones, and
+    nodes shared in the tree (e.g. inherited rules) are written once. Each
+    node is:
+        class index, option count, option codes..., child count, child indexes...
+    where an option code is 0 for None, 1 for False, 2 for True and 3 plus
+    the string table index for a string. The root element is the last node.
+
+    Loaded trees are already propagated and must not be propagated again."""
+
+    magic = "\x89PFWEDD\n"
+    version = 1
+
+    # header: magic, version, string count, integer count (little endian)
+    header = struct.Struct("<8sIII")
+
+    elementClasses = [
+        Root,
+        GroupDomain,
+        Domain,
+        GroupConfiguration,
+        Configuration,
+        Operator,
+        Rule,
+        GroupPath,
+        Path
+        ]
+
+    constants = [None, False, True]
+
+    # integer array type code of unsigned 32 bits integers
+    intTypeCode = "I" if array("I").itemsize == 4 else "L"
+
+    def isPrecompiled(self, content):
+        """return True if content starts as a precompiled EDD"""
+        return content.startswith(self.magic)
+
+    def dump(self, root, stream):
+        """write a propagated tree to a stream"""
+        strings = []
+        stringIndexes = {}
+        classIndexes = dict((elementClass, index)
+                for index, elementClass in enumerate(self.elementClasses))
+        nodeIndexes = {}
+        ints = array(self.intTypeCode)
+
+        def encodeOption(value):
+            for index, constant in enumerate(self.constants) :
+                if value is constant :
+                    return index
+
+            if not isinstance(value, str) :
+                raise PrecompiledFormatError("unsupported option value " + repr(value))
+
+            index = stringIndexes.get(value)
+            if index == None :
+                index = stringIndexes[value] = len(strings)
+                strings.append(value)
+            return len(self.constants) + index
+
+        def encodeElement(element):
+            if id(element) in nodeIndexes :
+                return nodeIndexes[id(element)]
+
+            children = [encodeElement(child) for child in element.children]
+
+            try :
+                ints.append(classIndexes[element.__class__])
+            except KeyError :
+                raise PrecompiledFormatError("unsupported element " + element.tag)
+            ints.append(len(element.option.values))
+            ints.extend([encodeOption(value) for value in element.option.values])
+            ints.append(len(children))
+            ints.extend(children)
+
+            index = nodeIndexes[id(element)] = len(nodeIndexes)
+            return index
+
+        encodeElement(root)
+
+        lengths = array(self.intTypeCode, [len(string) for string in strings])
+        if sys.byteorder != "little" :
+            lengths.byteswap()
+            ints.byteswap()
+
+        stream.write(self.header.pack(self.magic, self.version, len(strings), len(ints)))
+        stream.write(lengths.tostring())
+        stream.write("".join(strings))
+        stream.write(ints.tostring())
+
+    def load(self, content):
+        """return the propagated tree described by a precompiled EDD content"""
+        offset = self.header.size
+        try :
+            magic, version, stringCount, intCount = self.header.unpack(content[:offset])
+        except struct.error :
+            raise PrecompiledFormatError("truncated header")
+
+        if magic != self.magic :
+            raise PrecompiledFormatError("not a precompiled EDD")
+        if version != self.version :
+            raise PrecompiledFormatError("unsupported version " + str(version))
+
+        def readInts(count):
+            end = offset + 4 * count
+            if len(content) < end :
+                raise PrecompiledFormatError("truncated content")
+            ints = array(self.intTypeCode)
+            ints.fromstring(content[offset:end])
+            if sys.byteorder != "little" :
+                ints.byteswap()
+            return ints.tolist(), end
+
+        lengths, offset = readInts(stringCount)
+        values = list(self.constants)
+        for length in lengths :
+            values.append(content[offset:offset + length])
+            offset += length
+
+        ints, offset = readInts(intCount)
+
+        # Elements are created without calling their constructor, which would
+        # only set attributes overwritten here anyway. None of them is garbage:
+        # the cyclic garbage collector would only slow the load down.
+        nodes = []
+        gcWasEnabled = gc.isenabled()
+        gc.disable()
+        try :
+            position = 0
+            while position < intCount :
+                elementClass = self.elementClasses[ints[position]]
+                end = position + 2 + ints[position + 1]
+
+                option = Options.__new__(Options)
+                option.names = elementClass.optionNames
+                option.values = tuple([values[code] for code in ints[position + 2:end]])
+
+                element = elementClass.__new__(elementClass)
+                element.option = option
+
+                position = end + 1 + ints[end]
+                if position > end + 1 :
+                    element.children = [nodes[index] for index in ints[end + 1:position]]
+                else :
+                    element.children = Element.noChildren
+
+                if isinstance(element, Configuration) :
+                    element.configurableElements = None
+                elif isinstance(element, Rule) :
+                    element.formattedSyntax = None
+
+                nodes.append(element)
+
+            return nodes[-1]
+
+        except IndexError :
+            raise PrecompiledFormatError("corrupted content")
 
+        finally :
+            if gcWasEnabled :
+                gc.enable()
@@ -29,10 +29,14 @@
 # SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 import EddParser
-from PfwBaseTranslator import PfwBaseTranslator
+import EddCache
+from PfwBaseTranslator import PfwBaseTranslator, PfwRecordingTranslator
 
 import argparse
+import gzip
 import sys
+from cStringIO import StringIO
+from itertools import chain
 
 class PfwScriptTranslator(PfwBaseTranslator):
 
@@ -44,35 +48,38 @@ class PfwScriptTranslator(PfwBaseTranslator):
     def getScript(self):
         return self._script
 
+    def _append(self, command):
+        self._script.append(command)
+
     def _doCreateDomain(self, name):
-        self._script.append(
+        self._append(
                 "{cmd} {domain}".format(
                 cmd="createDomain",
                 domain=name))
 
     def _doSetSequenceAware(self):
-        self._script.append(
+        self._append(
                 "{cmd} {domain} {aware}".format(
                 cmd="setSequenceAwareness",
                 domain=self._ctx_domain,
                 aware="true"))
 
     def _doAddElement(self, path):
-        self._script.append(
+        self._append(
                 "{cmd} {domain} {path}".format(
                 cmd="addElement",
                 domain=self._ctx_domain,
                 path=path))
 
     def _doCreateConfiguration(self, name):
-        self._script.append(
+        self._append(
                 "{cmd} {domain} {config}".format(
                 cmd="createConfiguration",
                 domain=self._ctx_domain,
                 config=name))
 
     def _doSetElementSequence(self, paths):
-        self._script.append(
+        self._append(
                 "{cmd} {domain} {config} {paths}".format(
                 cmd="setElementSequence",
                 domain=self._ctx_domain,
@@ -80,7 +87,7 @@ class PfwScriptTranslator(PfwBaseTranslator):
                 paths=" ".join(paths)))
 
     def _doSetRule(self, rule):
-        self._script.append(
+        self._append(
                 "{cmd} {domain} {config} {rule}".format(
                 cmd="setRule",
                 domain=self._ctx_domain,
@@ -88,7 +95,7 @@ class PfwScriptTranslator(PfwBaseTranslator):
                 rule=rule))
 
     def _doSetParameter(self, path, value):
-        self._script.append(
+        self._append(
                 "{cmd} {domain} {config} {path} '{value}'".format(
                 cmd="setConfigurationParameter",
                 domain=self._ctx_domain,
@@ -96,6 +103,33 @@ class PfwScriptTranslator(PfwBaseTranslator):
                 path=path,
                 value=value))
 
+class PfwScriptWriter(PfwScriptTranslator):
+    """Writes the translated commands to a file-like object
+
+    Commands are buffered and written by chunks of 'bufferSize' commands,
+    separated by newlines as in the script of PfwScriptTranslator. 'flush'
+    must be called once the translation is over."""
+
+    bufferSize = 4096
+
+    def __init__(self, output):
+        super(PfwScriptWriter, self).__init__()
+
+        self._output = output
+        self._separator = ""
+
+    def _append(self, command):
+        self._script.append(command)
+        if len(self._script) >= self.bufferSize:
+            self.flush()
+
+    def flush(self):
+        """Write the buffered commands"""
+        if self._script:
+            self._output.write(self._separator + "\n".join(self._script))
+            self._separator = "\n"
+            del self._script[:]
+
 class ArgparseArgumentParser(object) :
     """class that parse command line arguments with argparse library
 
@@ -106,20 +140,36 @@ class ArgparseArgumentParser(object) :
 
         myArgParser.add_argument('input', nargs='?',
                 type=argparse.FileType('r'), default=sys.stdin,
-                help="the domain script file, default stdin")
+                help="the domain script file, either in EDD syntax or precompiled, default stdin")
 
         myArgParser.add_argument('-o', '--output',
                 type=argparse.FileType('w'), default=sys.stdout,
                 help="the output file, default stdout")
 
+        myArgParser.add_argument('-z', '--gzip',
+                action='store_true',
+                help="compress the output with gzip")
+
         myArgParser.add_argument('-d', '--debug',
                 action='store_true',
                 help="print debug warnings")
 
         myArgParser.add_argument('--output-kind',
-                choices=['pfw', 'raw'],
+                choices=['pfw', 'raw', 'precompiled'],
                 default='pfw',
-                help="output kind; can be either 'raw' (debug only) or 'pfw' (pfw commands; default choice)")
+                help="output kind; can be either 'raw' (debug only), 'pfw' (pfw commands; default choice) \
+                        or 'precompiled' (propagated EDD, which can be given back as input)")
+
+        myArgParser.add_argument('--cache-dir',
+                default=None,
+                help="directory where the translation of the input is cached; \
+                        an unchanged input is then not parsed again (pfw output kind only)")
+
+        myArgParser.add_argument('--stream',
+                action='store_true',
+                help="propagate, translate and write each top level domain as soon as it \
+                        is parsed, so that only one is held in memory (pfw output kind only); \
+                        on error, the domains preceding the faulty one have already been written")
 
 
         # process command line arguments
@@ -128,11 +178,17 @@ class ArgparseArgumentParser(object) :
         # maping to atributs
         self.input = options.input
         self.output = options.output
+        if options.gzip:
+            self.output = gzip.GzipFile(fileobj=options.output, mode='wb')
 
         self.debug = options.debug
 
         self.output_kind = options.output_kind
 
+        self.cache_dir = options.cache_dir
+
+        self.stream = options.stream
+
 
 # ==============
 # main function
@@ -142,13 +198,48 @@ def printE(s):
     """print in stderr"""
     sys.stderr.write(str(s))
 
-def main ():
+def generate (options):
+    """Write the translation of the input as requested by the options"""
 
-    options = ArgparseArgumentParser()
+    precompiledFormat = EddParser.PrecompiledFormat()
+
+    # precompiled EDDs are recognized by their first bytes
+    stream = options.input
+    head = stream.read(len(precompiledFormat.magic))
+    precompiled = precompiledFormat.isPrecompiled(head)
+
+    cache = None
+    if options.output_kind == 'pfw' and options.cache_dir is not None and not precompiled:
+        cache = EddCache.EddCache(options.cache_dir)
+
+    if precompiled or cache is not None:
+        content = head + stream.read()
+        stream = StringIO(content)
+    else:
+        stream = chain(StringIO(head + stream.readline()), stream)
+
+    if cache is not None:
+        recording = cache.load(content)
+        if recording is not None:
+            writer = PfwScriptWriter(options.output)
+            recording.translate(writer)
+            writer.flush()
+            return
 
     myparser = EddParser.Parser()
+
     try:
-        myroot = myparser.parse(options.input, options.debug)
+        if precompiled:
+            myroot = precompiledFormat.load(content)
+            elements = [myroot]
+
+        elif options.stream and options.output_kind == 'pfw':
+            # top level elements are yielded as soon as they are parsed
+            elements = myparser.parseElements(stream, options.debug)
+
+        else:
+            myroot = myparser.parse(stream, options.debug)
+            elements = [myroot]
 
     except EddParser.MySyntaxError as ex:
         printE(ex)
@@ -156,20 +247,53 @@ def main ():
         exit(2)
 
     if options.output_kind == 'raw':
-        options.output.write(str(myroot))
-    else:
-        try:
-            myroot.propagate()
-
-        except EddParser.MyPropagationError, ex :
-            printE(ex)
-            printE("EXIT ON FAILURE")
-            exit(1)
-
-        if options.output_kind == 'pfw':
-            translator = PfwScriptTranslator()
-            myroot.translate(translator)
-            options.output.write("\n".join(translator.getScript()))
+        options.output.writelines(myroot.iterRawLines())
+        return
+
+    recording = None
+    if cache is not None:
+        recording = PfwRecordingTranslator()
+
+    writer = PfwScriptWriter(options.output)
+    try:
+        for element in elements:
+            # precompiled trees are already propagated
+            if not precompiled:
+                try:
+                    element.propagate(EddParser.PropagationContext())
+
+                except EddParser.MyPropagationError, ex :
+                    printE(ex)
+                    printE("EXIT ON FAILURE")
+                    exit(1)
+
+            if options.output_kind == 'precompiled':
+                precompiledFormat.dump(element, options.output)
+                continue
+
+            if recording is not None:
+                element.translate(recording)
+
+            element.translate(writer)
+            writer.flush()
+
+    except EddParser.MySyntaxError as ex:
+        printE(ex)
+        printE("EXIT ON FAILURE")
+        exit(2)
+
+    if cache is not None:
+        cache.store(content, recording)
+
+def main ():
+
+    options = ArgparseArgumentParser()
+
+    try:
+        generate(options)
+    finally:
+        # a gzip output is only complete once closed
+        options.output.close()
 
 # execute main function if the python interpreter is running this module as the main program
 if __name__ == "__main__" :
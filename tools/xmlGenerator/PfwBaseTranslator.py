@@ -99,6 +99,19 @@ class PfwBaseTranslator(object):
 
         self._check(self._doAddElement)(path)
 
+    def addElements(self, paths):
+        """Add several configurable elements to the current domain
+
+        Equivalent to calling 'addElement' for each path, unless the backend
+        handles all of them at once (see the batch implementation methods)."""
+
+        self._ctx_command = "addElements"
+
+        if not self._domain_valid:
+            return
+
+        self._handleExceptions(self._doAddElements(paths))
+
     def createConfiguration(self, name):
         """Create a configuration for the current domain"""
 
@@ -147,9 +160,28 @@ class PfwBaseTranslator(object):
 
         self._check(self._doSetParameter)(path, value)
 
+    def setParameters(self, parameters):
+        """Set several parameter values for the current configuration
+
+        'parameters' is an iterable of (path, value) tuples. Equivalent to
+        calling 'setParameter' for each of them, unless the backend handles
+        all of them at once (see the batch implementation methods)."""
+
+        self._ctx_command = "setParameters"
+
+        if not self._configuration_valid:
+            return
+
+        self._handleExceptions(self._doSetParameters(parameters))
+
     def _handleException(self, exception):
         raise exception
 
+    def _handleExceptions(self, exceptions):
+        """Handle each of the exceptions returned by a batch method"""
+        for exception in exceptions:
+            self._handleException(exception)
+
     def _notImplemented(self):
         raise NotImplementedError(
             "{} is an abstract class".format(self.__class__))
@@ -175,3 +207,70 @@ class PfwBaseTranslator(object):
 
     def _doSetParameter(self, path, value):
         self._notImplemented()
+
+    # Batch implementation methods
+    #
+    # By default, they call the implementation method of each item in turn
+    # and handle its failure before the next call, as the single-item methods
+    # do: if '_handleException' raises, the remaining items are not processed.
+    #
+    # Backends able to process a whole batch at once may override them. Such
+    # a backend processes every item, even after a failed one, and returns the
+    # list of PfwExceptions that occured, in the order of the items; they are
+    # only handled once the whole batch has been processed.
+    def _doAddElements(self, paths):
+        for path in paths:
+            self._check(self._doAddElement)(path)
+
+        return []
+
+    def _doSetParameters(self, parameters):
+        for path, value in parameters:
+            self._check(self._doSetParameter)(path, value)
+
+        return []
+
+class PfwRecordingTranslator(object):
+    """Records calls to the translator protocol
+
+    The protocol is the public one presented by PfwBaseTranslator. Recorded
+    calls can be replayed, in the same order, into any translator through the
+    'translate' method; a recording can thus be used in place of a parsed EDD
+    tree."""
+
+    def __init__(self, commands=None):
+        if commands is None:
+            commands = []
+        self._commands = commands
+
+    def getCommands(self):
+        """Return the list of recorded (method name, arguments) tuples"""
+        return self._commands
+
+    def translate(self, translator):
+        for method, args in self._commands:
+            getattr(translator, method)(*args)
+
+    def createDomain(self, name, sequence_aware=False):
+        self._commands.append(("createDomain", (name, sequence_aware)))
+
+    def addElement(self, path):
+        self._commands.append(("addElement", (path,)))
+
+    def createConfiguration(self, name):
+        self._commands.append(("createConfiguration", (name,)))
+
+    def setElementSequence(self, paths):
+        self._commands.append(("setElementSequence", (list(paths),)))
+
+    def setRule(self, rule):
+        self._commands.append(("setRule", (rule,)))
+
+    def setParameter(self, path, value):
+        self._commands.append(("setParameter", (path, value)))
+
+    def addElements(self, paths):
+        self._commands.append(("addElements", (list(paths),)))
+
+    def setParameters(self, parameters):
+        self._commands.append(("setParameters", (list(parameters),)))
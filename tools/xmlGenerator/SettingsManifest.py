@@ -0,0 +1,141 @@
+# Copyright (c) 2015, Intel Corporation
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification,
+# are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation and/or
+# other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR
+# ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON
+# ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""Manifest of the inputs generated settings depend on
+
+Along with the settings it generates, domainGenerator may write a manifest
+made of:
+- a digest of the inputs all domains depend on (top-level configuration,
+  structure files, criteria, initial settings...),
+- for each domain source (single domain file or EDD file), in the command line
+  order, a digest of its content and the names of the domains it produced.
+
+Given the previous settings and their manifest, only the domains of new or
+changed sources have to be generated again; the domains of removed or changed
+sources are deleted from the previous settings."""
+
+import hashlib
+import json
+import os
+import tempfile
+
+# To be incremented each time the layout of a manifest changes
+MANIFEST_FORMAT_VERSION = 2
+
+# Paths and domain names are byte strings, handed back to the Pfw bindings as
+# such; they are stored as Latin-1 text so that any byte survives JSON
+ENCODING = "latin-1"
+
+def getDigest(content):
+    return hashlib.sha1(content).hexdigest()
+
+def getBaseDigest(contents):
+    """Return the digest of the inputs all domains depend on
+
+    'contents' is a list of strings; their order matters."""
+    digest = hashlib.sha1(str(MANIFEST_FORMAT_VERSION))
+    for content in contents:
+        # Prefix each content with its size so that the boundaries count
+        digest.update("{}:".format(len(content)))
+        digest.update(content)
+    return digest.hexdigest()
+
+class SettingsManifest(object):
+    """Inputs of generated settings, see the module documentation"""
+
+    def __init__(self, baseDigest, sources=None):
+        self._baseDigest = baseDigest
+        self._sources = []
+
+        for key, digest, domains in sources or []:
+            self.addSource(key, digest, domains)
+
+    def getBaseDigest(self):
+        return self._baseDigest
+
+    def addSource(self, key, digest, domains):
+        """Add a domain source
+
+        'key' identifies the source, e.g. its kind and path, 'digest' is the
+        digest of its content and 'domains' the names of its domains."""
+        self._sources.append((key, digest, list(domains)))
+
+    def getSources(self):
+        """Return the list of (key, digest, domain names) tuples"""
+        return self._sources
+
+    def getDomains(self, key, digest):
+        """Return the names of the domains of an unchanged source
+
+        Return None if there is no such source or if its digest differs."""
+        for sourceKey, sourceDigest, domains in self._sources:
+            if sourceKey == key:
+                return domains if sourceDigest == digest else None
+        return None
+
+    def save(self, path):
+        content = json.dumps({
+            "version": MANIFEST_FORMAT_VERSION,
+            "base": self._baseDigest,
+            "sources": self._sources},
+            encoding=ENCODING)
+
+        # Write to a temporary file first so that an interrupted generator
+        # never leaves a partial manifest
+        fd, tmpPath = tempfile.mkstemp(
+                dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as manifestFile:
+                manifestFile.write(content)
+            os.rename(tmpPath, path)
+        except:
+            os.remove(tmpPath)
+            raise
+
+def load(path):
+    """Return the SettingsManifest stored in a file
+
+    Return None if the file does not exist, is unreadable or has another
+    layout version."""
+    try:
+        with open(path, 'rb') as manifestFile:
+            content = json.load(manifestFile)
+    except (IOError, ValueError):
+        return None
+
+    if not isinstance(content, dict) or content.get("version") != MANIFEST_FORMAT_VERSION:
+        return None
+
+    # JSON strings are loaded as unicode, which the bindings do not accept
+    try:
+        return SettingsManifest(content["base"].encode(ENCODING),
+                [(tuple(part.encode(ENCODING) for part in key),
+                    digest.encode(ENCODING),
+                    [domain.encode(ENCODING) for domain in domains])
+                    for key, digest, domains in content["sources"]])
+    except (AttributeError, KeyError, TypeError, ValueError):
+        return None
@@ -30,15 +30,23 @@
 
 import PyPfw
 import EddParser
-from PfwBaseTranslator import PfwBaseTranslator, PfwException
+import EddCache
+import SettingsManifest
+from PfwBaseTranslator import PfwBaseTranslator, PfwException, PfwRecordingTranslator
 import hostConfig
 
 import argparse
 import re
 import sys
-import tempfile
 import os
 import logging
+import json
+import xml.dom.minidom
+import xml.etree.ElementTree as ElementTree
+import multiprocessing
+from cStringIO import StringIO
+from urlparse import urlparse
+from itertools import imap, izip
 
 def wrap_pfw_error_semantic(func):
     def wrapped(*args, **kwargs):
@@ -95,6 +103,26 @@ class PfwTranslator(PfwBaseTranslator):
 
         return ok, error
 
+    # Batches cross the bindings once, instead of once per item
+    def _doAddElements(self, paths):
+        errors = PyPfw.StringVector()
+        self._pfw.addConfigurableElementsToDomain(self._ctx_domain, list(paths), errors)
+
+        return [PfwException(error) for error in errors]
+
+    def _doSetParameters(self, parameters):
+        paths = []
+        values = []
+        for path, value in parameters:
+            paths.append(path)
+            values.append(value)
+
+        errors = PyPfw.StringVector()
+        self._pfw.setConfigurationValues(
+                self._ctx_domain, self._ctx_configuration, paths, values, errors)
+
+        return [PfwException(error) for error in errors]
+
 
 class PfwTranslationErrorHandler:
     def __init__(self):
@@ -117,6 +145,287 @@ class PfwLogger(PyPfw.ILogger):
         log_func = self.__logger.warning if is_warning else self.__logger.info
         log_func(message)
 
+def parse_edd(edd):
+    """Parse and propagate the content of an EDD file
+
+    Precompiled EDD files are loaded as is, they are already propagated.
+
+    'edd' is a (content, verbose, record) tuple. If 'record' is True, the
+    translation of the propagated tree is recorded and returned instead of the
+    tree itself; unlike the tree, a recording can cheaply be sent back from a
+    worker process.
+
+    Return a (result, exit status) tuple. On failure, the result is None and
+    the error has already been logged."""
+    content, verbose, record = edd
+    precompiledFormat = EddParser.PrecompiledFormat()
+
+    try:
+        if precompiledFormat.isPrecompiled(content):
+            root = precompiledFormat.load(content)
+        else:
+            root = EddParser.Parser().parse(StringIO(content), verbose)
+            root.propagate()
+    except EddParser.MySyntaxError as ex:
+        logging.critical(str(ex))
+        return None, 2
+    except EddParser.MyPropagationError, ex :
+        logging.critical(str(ex))
+        return None, 1
+
+    if record:
+        recording = PfwRecordingTranslator()
+        root.translate(recording)
+        return recording, 0
+
+    return root, 0
+
+def start_pfw(toplevel_config, all_criteria, validate, schemas_dir,
+        share_criterion_types=True):
+    """Create and start a Pfw instance in tuning mode, with all the criteria
+
+    If 'share_criterion_types' is False, each criterion gets a type of its own,
+    as platforms usually do: the criterion types are part of the structure
+    checksum that binary settings are bound to.
+
+    Return a (pfw, logger) tuple; the logger has to be kept as long as the pfw
+    is used. On failure, both are None and the error has already been
+    logged."""
+
+    # We need to modify the toplevel configuration file to account for differences
+    # between development setup and target (installation) setup, in particular, the
+    # TuningMode must be enforced, regardless of what will be allowed on the target.
+    # The modified content is given to the Pfw in place of the file's own.
+    toplevel_config = os.path.realpath(toplevel_config)
+    install_path = os.path.dirname(toplevel_config)
+    host_config = xml.dom.minidom.parse(toplevel_config)
+    hostConfig.configureDocument(host_config, structPath=install_path)
+
+    # Create a new Pfw instance
+    pfw = PyPfw.ParameterFramework(toplevel_config)
+    pfw.setConfigurationFileContent(host_config.toxml("utf-8"))
+
+    # create and inject all the criteria; unless told otherwise, criteria with
+    # the same inclusiveness and values share their type
+    logging.info("Creating all criteria")
+    criterion_types = {}
+    for criterion in all_criteria:
+        if share_criterion_types:
+            type_key = (criterion['inclusive'], tuple(criterion['values']))
+        else:
+            type_key = criterion['name']
+        criterion_type = criterion_types.get(type_key)
+
+        if criterion_type is None:
+            criterion_type = pfw.createSelectionCriterionType(criterion['inclusive'])
+
+            numericals = range(len(criterion['values']))
+            if criterion['inclusive']:
+                # inclusive criteria are "bitfields"
+                numericals = [1 << numerical for numerical in numericals]
+
+            ok, error = pfw.addSelectionCriterionTypeValuePairs(
+                    criterion_type, numericals, criterion['values'])
+            if not ok:
+                logging.critical("{} for {}".format(error, criterion['name']))
+                return None, None
+
+            criterion_types[type_key] = criterion_type
+
+        # we don't need the reference to the created criterion; ignore the
+        # return value
+        pfw.createSelectionCriterion(criterion['name'], criterion_type)
+
+    # Set failure conditions
+    pfw.setFailureOnMissingSubsystem(False)
+    pfw.setFailureOnFailedSettingsLoad(False)
+    if validate:
+        pfw.setValidateSchemasOnStart(True)
+        if schemas_dir is None:
+            schemas_dir = os.path.join(install_path, "Schemas")
+        pfw.setSchemaFolderLocation(schemas_dir)
+
+    logger = PfwLogger()
+    pfw.setLogger(logger)
+
+    # Disable the remote interface because we don't need it and it might
+    # get in the way (e.g. the port is already in use)
+    pfw.setForceNoRemoteInterface(True)
+
+    # Finally, start the Pfw
+    ok, error = pfw.start()
+    if not ok:
+        logging.critical("Error while starting the pfw: {}".format(error))
+        return None, None
+
+    ok, error = pfw.setTuningMode(True)
+    if not ok:
+        logging.critical(error)
+        return None, None
+
+    return pfw, logger
+
+def read_file(path):
+    with open(path, 'rb') as input_file:
+        return input_file.read()
+
+XINCLUDE_TAGS = ["{http://www.w3.org/2001/XInclude}include",
+        "{http://www.w3.org/2003/XInclude}include"]
+
+def get_structure_files(toplevel_config):
+    """Return the paths of the files describing the structure
+
+    These are the system class file, the subsystem files it includes and the
+    files they include through XInclude, recursively. Raise IOError,
+    ElementTree.ParseError or ValueError if one of them cannot be found or
+    followed."""
+    config_folder = os.path.dirname(os.path.realpath(toplevel_config))
+    location = ElementTree.parse(toplevel_config).find(
+            "StructureDescriptionFileLocation")
+    if location is None or not location.get("Path"):
+        raise ValueError("{} has no structure description file".format(
+            toplevel_config))
+    system_class = os.path.join(config_folder, location.get("Path"))
+    system_class_folder = os.path.dirname(system_class)
+
+    # (path, parsed) pairs, depth first and in document order
+    structure_files = []
+    to_visit = [(os.path.realpath(system_class), True)]
+    while to_visit:
+        path, parsed = to_visit.pop()
+        if (path, parsed) in structure_files:
+            continue
+        structure_files.append((path, parsed))
+        if not parsed:
+            continue
+
+        includes = []
+        for element in ElementTree.parse(path).iter():
+            if element.tag == "SubsystemInclude":
+                # Relative to the system class file, wherever it is included
+                includes.append((os.path.join(system_class_folder,
+                    element.get("Path", "")), True))
+            elif element.tag in XINCLUDE_TAGS:
+                href = element.get("href")
+                # Without href, the including document itself is referred to
+                if not href:
+                    continue
+                if urlparse(href).scheme:
+                    raise ValueError("{} includes {}, which is not a local file".format(
+                        path, href))
+                includes.append((os.path.join(os.path.dirname(path), href),
+                    element.get("parse", "xml") == "xml"))
+
+        to_visit += [(os.path.realpath(include), parsed)
+                for include, parsed in reversed(includes)]
+
+    return [path for path, _ in structure_files]
+
+def get_domain_name(domain_file):
+    """Return the name of the domain of a single domain file"""
+    # Only the root element is needed; the file is not parsed further
+    for _, element in ElementTree.iterparse(domain_file, events=("start",)):
+        name = element.get("Name")
+        # ElementTree returns non-ASCII text as unicode, the Pfw names are UTF-8
+        if isinstance(name, unicode):
+            name = name.encode("utf-8")
+        return name
+
+def get_recorded_domains(recording):
+    """Return the names of the domains created by a recording"""
+    return [args[0] for method, args in recording.getCommands()
+            if method == "createDomain"]
+
+def split_domains(recording):
+    """Split the recording of an EDD file into one recording per domain"""
+    domains = []
+    for command in recording.getCommands():
+        if command[0] == "createDomain":
+            domains.append([])
+        domains[-1].append(command)
+
+    return [PfwRecordingTranslator(commands) for commands in domains]
+
+def reorder_domains(pfw, current, expected):
+    """Move domains so that they follow the 'expected' order
+
+    'current' is the order of these domains in the Pfw instance; they come
+    after any other domain. A domain is moved by deleting and importing it
+    again, which appends it to the list: the domains from the first one out
+    of place onwards are moved, in the 'expected' order. Return False on
+    failure."""
+    in_place = 0
+    for current_name, expected_name in izip(current, expected):
+        if current_name != expected_name:
+            break
+        in_place += 1
+
+    for name in expected[in_place:]:
+        logging.info("Moving domain {}".format(name))
+        ok, domain_xml, error = pfw.exportSingleDomainXml("", name, True, False)
+        if ok:
+            ok, error = pfw.deleteDomain(name)
+        if ok:
+            ok, error = pfw.importSingleDomainXml(domain_xml, False, False)
+        if not ok:
+            logging.critical(error)
+            return False
+
+    return True
+
+def shard_domains(domains, count):
+    """Spread domains over 'count' shards of similar translation cost
+
+    'domains' is a list of domain recordings. Return a list of shards, each
+    shard being a list of indexes in 'domains', in increasing order. The
+    result only depends on the domains and on 'count'."""
+    shards = [[] for _ in range(count)]
+    loads = [0] * count
+
+    # biggest domains first, each one to the least loaded shard
+    by_size = sorted(range(len(domains)),
+            key=lambda index: -len(domains[index].getCommands()))
+    for index in by_size:
+        shard = loads.index(min(loads))
+        shards[shard].append(index)
+        loads[shard] += len(domains[index].getCommands())
+
+    return [sorted(shard) for shard in shards if shard]
+
+def inject_domains(job):
+    """Inject domains into a Pfw instance of its own and export them
+
+    'job' is a (start_pfw arguments, domain recordings) tuple.
+
+    Return a (domain XML list, exit status) tuple, the list being in the order
+    of the recordings. On failure, the list is None and the error has already
+    been logged."""
+    pfw_args, domains = job
+
+    pfw, logger = start_pfw(*pfw_args)
+    if pfw is None:
+        return None, 1
+
+    error_handler = PfwTranslationErrorHandler()
+    translator = PfwTranslator(pfw, error_handler)
+
+    for domain in domains:
+        domain.translate(translator)
+    if error_handler.hasFailed():
+        return None, 1
+
+    domain_xmls = []
+    for domain in domains:
+        # the recording starts with the domain creation
+        _, (name, _) = domain.getCommands()[0]
+        ok, domain_xml, error = pfw.exportSingleDomainXml("", name, True, False)
+        if not ok:
+            logging.critical(error)
+            return None, 1
+        domain_xmls.append(domain_xml)
+
+    return domain_xmls, 0
+
 # If this file is directly executed
 if __name__ == "__main__":
     logging.root.setLevel(logging.INFO)
@@ -152,6 +461,45 @@ if __name__ == "__main__":
             nargs='*',
             default=[],
             dest='edd_files')
+    argparser.add_argument('--edd-cache-dir',
+            help="Directory where the translation of each EDD file is cached; \
+        unchanged EDD files are then not parsed again",
+            metavar="CACHE_DIR",
+            default=None)
+    argparser.add_argument('--jobs',
+            help="Number of processes parsing the EDD files in parallel. \
+        The resulting settings do not depend on this number",
+            metavar="N",
+            type=int,
+            default=1)
+    argparser.add_argument('--injection-jobs',
+            help="Number of processes injecting the domains of the EDD \
+        files, each one into a Pfw instance of its own. The domains are then \
+        merged in the command line order",
+            metavar="N",
+            type=int,
+            default=1)
+    argparser.add_argument('--binary-settings',
+            help="Write the settings to this file in binary format, to be \
+        referenced as BinarySettingsFileLocation on target; the XML output \
+        then only contains the domains, without their settings. The file is \
+        bound to the number of criterion types: identical criteria do not \
+        share their type in this mode: each criterion gets one of its own, \
+        as it must on target",
+            metavar="BINARY_SETTINGS_FILE",
+            default=None)
+    argparser.add_argument('--manifest',
+            help="Write a manifest of the inputs of the settings to this \
+        file; see --previous-output",
+            metavar="MANIFEST_FILE",
+            default=None)
+    argparser.add_argument('--previous-output',
+            help="Settings previously generated along with --manifest. \
+        Incremental mode: they are loaded and only the domains whose source \
+        changed since are generated again. This must not be the file the \
+        output is written to",
+            metavar="XML_SETTINGS_FILE",
+            default=None)
     argparser.add_argument('--schemas-dir',
             help="Directory of parameter-framework XML Schemas for generation \
         validation",
@@ -169,6 +517,13 @@ if __name__ == "__main__":
 
     args = argparser.parse_args()
 
+    if args.previous_output is not None:
+        if args.manifest is None:
+            argparser.error("--previous-output requires --manifest")
+        if args.binary_settings is not None:
+            argparser.error("--previous-output cannot be used with \
+--binary-settings: the previous output would not contain any setting")
+
     #
     # Criteria file
     #
@@ -207,92 +562,208 @@ if __name__ == "__main__":
             "inclusive" : criterion_inclusiveness,
             "values" : criterion_values})
 
+    #
+    # Manifest
+    #
+    # It records the inputs all domains depend on and, for each domain source,
+    # its digest and the names of its domains. In incremental mode, the domains
+    # of the unchanged sources are kept from the previous output; the others
+    # are deleted and generated again.
+    manifest = None
+    previous_manifest = None
+    kept_sources = set()
+    if args.manifest is not None:
+        try:
+            structure_files = get_structure_files(args.toplevel_config)
+        except (IOError, ElementTree.ParseError, ValueError) as ex:
+            # Settings generated from an unknown structure cannot be reused:
+            # no manifest must remain
+            logging.warning("Cannot list the structure files ({}): no manifest \
+is written and all the settings are generated".format(ex))
+            if os.path.exists(args.manifest):
+                os.remove(args.manifest)
+            args.manifest = None
+
+    if args.manifest is not None:
+        base_contents = [
+                EddCache.getGeneratorVersion(),
+                read_file(args.toplevel_config),
+                json.dumps(all_criteria, sort_keys=True),
+                read_file(args.initial_settings) if args.initial_settings else "",
+                args.target_schemas_dir]
+        base_contents += [read_file(path) for path in structure_files]
+        manifest = SettingsManifest.SettingsManifest(
+                SettingsManifest.getBaseDigest(base_contents))
+
+        if args.previous_output is not None:
+            previous_manifest = SettingsManifest.load(args.manifest)
+            if previous_manifest is None \
+                    or previous_manifest.getBaseDigest() != manifest.getBaseDigest() \
+                    or not os.path.isfile(args.previous_output):
+                logging.warning("No matching manifest and previous output: \
+generating all the settings")
+                previous_manifest = None
+
+    def get_unchanged_domains(key, digest):
+        if previous_manifest is None:
+            return None
+        return previous_manifest.getDomains(key, digest)
+
+    # Single domain files to import
+    xml_domain_files = []
+    for domain_file in args.xml_domain_files:
+        domain_file = os.path.realpath(domain_file)
+        if manifest is not None:
+            key = ("domains", domain_file)
+            digest = SettingsManifest.getDigest(read_file(domain_file))
+            domains = get_unchanged_domains(key, digest)
+            if domains is not None:
+                logging.info("Keeping the domain of unchanged single domain file {}".format(
+                    domain_file))
+                kept_sources.add(key)
+                manifest.addSource(key, digest, domains)
+                continue
+
+            manifest.addSource(key, digest, [get_domain_name(domain_file)])
+
+        xml_domain_files.append(domain_file)
+
     #
     # EDD files (aka ".pfw" files)
     #
     parsed_edds = []
+    edd_sources = []
+    edd_cache = None
+    if args.edd_cache_dir is not None:
+        edd_cache = EddCache.EddCache(args.edd_cache_dir)
+
+    edds_to_parse = []
     for edd_file in args.edd_files:
-        try:
-            root = parser = EddParser.Parser().parse(edd_file, args.verbose)
-        except EddParser.MySyntaxError as ex:
-            logging.critical(str(ex))
+        edd_content = edd_file.read()
+        if manifest is not None:
+            key = ("edd", os.path.realpath(edd_file.name))
+            digest = SettingsManifest.getDigest(edd_content)
+            domains = get_unchanged_domains(key, digest)
+            if domains is not None:
+                logging.info("Keeping the domains of unchanged EDD file {}".format(
+                    edd_file.name))
+                kept_sources.add(key)
+                edd_sources.append((key, digest, domains))
+                continue
+
+            # The domains are known once the file is parsed
+            edd_sources.append((key, digest, None))
+
+        if edd_cache is not None:
+            recording = edd_cache.load(edd_content)
+            if recording is not None:
+                logging.info("Using cached translation of EDD file {}".format(
+                    edd_file.name))
+                parsed_edds.append((edd_file.name, recording))
+                continue
+
+        # Keep the command line order: the parsing result takes this place
+        edds_to_parse.append((len(parsed_edds), edd_content))
+        parsed_edds.append((edd_file.name, None))
+
+    # Parsing and propagating EDD files are independent from each other and
+    # may be spread over several processes; the translation into the Pfw
+    # instance below is kept serial and in the command line order.
+    use_pool = args.jobs > 1 and len(edds_to_parse) > 1
+    record = use_pool or edd_cache is not None or args.injection_jobs > 1 \
+            or manifest is not None
+    jobs = [(edd_content, args.verbose, record)
+            for _, edd_content in edds_to_parse]
+    if use_pool:
+        pool = multiprocessing.Pool(args.jobs)
+        results = pool.map(parse_edd, jobs, chunksize=1)
+        pool.close()
+        pool.join()
+    else:
+        results = imap(parse_edd, jobs)
+
+    for (index, edd_content), (result, status) in izip(edds_to_parse, results):
+        if result is None:
             logging.info("EXIT ON FAILURE")
-            exit(2)
+            exit(status)
+
+        if edd_cache is not None:
+            edd_cache.store(edd_content, result)
+
+        parsed_edds[index] = (parsed_edds[index][0], result)
+
+    if manifest is not None:
+        recordings = (recording for _, recording in parsed_edds)
+        for key, digest, domains in edd_sources:
+            if domains is None:
+                domains = get_recorded_domains(next(recordings))
+            manifest.addSource(key, digest, domains)
+
+    pfw_args = (args.toplevel_config, all_criteria, args.validate, args.schemas_dir)
+
+    # Domains are independent from each other until they are exported: they
+    # may be injected into several Pfw instances, one per process, then merged
+    # into the main instance. Processes are forked before the main instance is
+    # started.
+    domain_xmls = None
+    if args.injection_jobs > 1:
+        domains = []
+        for _, parsed_edd in parsed_edds:
+            domains += split_domains(parsed_edd)
+
+        # Without any domain (no EDD file or no domain in them), there is
+        # nothing to inject nor to merge
+        if domains:
+            shards = shard_domains(domains, args.injection_jobs)
+            logging.info("Injecting {} domains in {} processes".format(
+                len(domains), len(shards)))
+
+            pool = multiprocessing.Pool(len(shards))
+            jobs = [(pfw_args, [domains[index] for index in shard])
+                    for shard in shards]
+            results = pool.map(inject_domains, jobs, chunksize=1)
+            pool.close()
+            pool.join()
+
+            domain_xmls = [None] * len(domains)
+            for shard, (shard_xmls, status) in izip(shards, results):
+                if shard_xmls is None:
+                    logging.error("Error while importing parsed EDD files.\n")
+                    exit(status)
+
+                for index, domain_xml in izip(shard, shard_xmls):
+                    domain_xmls[index] = domain_xml
+
+    # The binary settings are only loaded by a target whose structure checksum
+    # matches the one of the main instance
+    pfw, logger = start_pfw(*pfw_args,
+            share_criterion_types=args.binary_settings is None)
+    if pfw is None:
+        exit(1)
 
-        try:
-            root.propagate()
-        except EddParser.MyPropagationError, ex :
-            logging.critical(str(ex))
-            logging.info("EXIT ON FAILURE")
+    if previous_manifest is not None:
+        # Incremental mode: start from the previous output, which already
+        # contains the initial settings, without the domains to generate again
+        previous_output = os.path.realpath(args.previous_output)
+        logging.info(
+            "Importing previous settings file {}".format(previous_output))
+        ok, error = pfw.importDomainsXml(previous_output, True, True)
+        if not ok:
+            logging.critical(error)
             exit(1)
 
-        parsed_edds.append((edd_file.name, root))
-
-    # We need to modify the toplevel configuration file to account for differences
-    # between development setup and target (installation) setup, in particular, the
-    # TuningMode must be enforced, regardless of what will be allowed on the target
-    with tempfile.NamedTemporaryFile(mode='w') as fake_toplevel_config:
-        install_path = os.path.dirname(os.path.realpath(args.toplevel_config))
-        hostConfig.configure(
-                infile=args.toplevel_config,
-                outfile=fake_toplevel_config,
-                structPath=install_path)
-        fake_toplevel_config.flush()
-
-        # Create a new Pfw instance
-        pfw = PyPfw.ParameterFramework(fake_toplevel_config.name)
-
-        # create and inject all the criteria
-        logging.info("Creating all criteria")
-        for criterion in all_criteria:
-            criterion_type = pfw.createSelectionCriterionType(criterion['inclusive'])
-
-            for numerical, literal in enumerate(criterion['values']):
-                if criterion['inclusive']:
-                    # inclusive criteria are "bitfields"
-                    numerical = 1 << numerical
-
-                ok = criterion_type.addValuePair(numerical, literal)
+        for key, _, domains in previous_manifest.getSources():
+            if key in kept_sources:
+                continue
+            for domain in domains:
+                logging.info("Deleting domain {}".format(domain))
+                ok, error = pfw.deleteDomain(domain)
                 if not ok:
-                    logging.critical("valuepair {}/{} rejected for {}".format(
-                        numerical, literal, criterion['name']))
+                    logging.critical(error)
                     exit(1)
 
-            # we don't need the reference to the created criterion type; ignore the
-            # return value
-            pfw.createSelectionCriterion(criterion['name'], criterion_type)
-
-        # Set failure conditions
-        pfw.setFailureOnMissingSubsystem(False)
-        pfw.setFailureOnFailedSettingsLoad(False)
-        if args.validate:
-            pfw.setValidateSchemasOnStart(True)
-            if args.schemas_dir is not None:
-                schemas_dir = args.schemas_dir
-            else:
-                schemas_dir = os.path.join(install_path, "Schemas")
-            pfw.setSchemaFolderLocation(schemas_dir)
-
-        logger = PfwLogger()
-        pfw.setLogger(logger)
-
-        # Disable the remote interface because we don't need it and it might
-        # get in the way (e.g. the port is already in use)
-        pfw.setForceNoRemoteInterface(True)
-
-        # Finally, start the Pfw
-        ok, error = pfw.start()
-        if not ok:
-            logging.critical("Error while starting the pfw: {}".format(error))
-            exit(1)
-
-    ok, error = pfw.setTuningMode(True)
-    if not ok:
-        logging.critical(error)
-        exit(1)
-
     # Import initial settings file
-    if args.initial_settings:
+    elif args.initial_settings:
         initial_settings = os.path.realpath(args.initial_settings)
         logging.info(
             "Importing initial settings file {}".format(initial_settings))
@@ -302,22 +773,45 @@ if __name__ == "__main__":
             exit(1)
 
     # Import each standalone domain files
-    for domain_file in args.xml_domain_files:
+    for domain_file in xml_domain_files:
         logging.info("Importing single domain file {}".format(domain_file))
-        ok, error = pfw.importSingleDomainXml(os.path.realpath(domain_file), False)
+        ok, error = pfw.importSingleDomainXml(domain_file, False, True)
         if not ok:
             logging.critical(error)
             exit(1)
 
-    # Parse and inject each EDD file
-    error_handler = PfwTranslationErrorHandler()
-    translator = PfwTranslator(pfw, error_handler)
-
-    for filename, parsed_edd in parsed_edds:
-        logging.info("Translating and injecting EDD file {}".format(filename))
-        parsed_edd.translate(translator)
-        if error_handler.hasFailed():
-            logging.error("Error while importing parsed EDD files.\n")
+    if domain_xmls is not None:
+        # Merge the domains injected by other processes, in the order of the
+        # EDD files
+        logging.info("Importing the domains of the EDD files")
+        for domain_xml in domain_xmls:
+            ok, error = pfw.importSingleDomainXml(domain_xml, False, False)
+            if not ok:
+                logging.critical(error)
+                exit(1)
+
+    else:
+        # Parse and inject each EDD file
+        error_handler = PfwTranslationErrorHandler()
+        translator = PfwTranslator(pfw, error_handler)
+
+        for filename, parsed_edd in parsed_edds:
+            logging.info("Translating and injecting EDD file {}".format(filename))
+            parsed_edd.translate(translator)
+            if error_handler.hasFailed():
+                logging.error("Error while importing parsed EDD files.\n")
+                exit(1)
+
+    if previous_manifest is not None:
+        # The kept domains come first, in the previous order, then the ones
+        # generated again; restore the order of a complete generation
+        current = [domain for key, _, domains in previous_manifest.getSources()
+                if key in kept_sources for domain in domains]
+        current += [domain for key, _, domains in manifest.getSources()
+                if key not in kept_sources for domain in domains]
+        expected = [domain for _, _, domains in manifest.getSources()
+                for domain in domains]
+        if not reorder_domains(pfw, current, expected):
             exit(1)
 
     # dirty hack: we change the schema location (right before exporting the
@@ -325,6 +819,21 @@ if __name__ == "__main__":
     # the machine that is generating the domains)
     pfw.setSchemaFolderLocation(args.target_schemas_dir)
 
-    # Export the resulting settings to the standard output
-    ok, domains, error = pfw.exportDomainsXml("", True, False)
-    sys.stdout.write(domains)
+    if args.binary_settings is not None:
+        ok, error = pfw.exportDomainsBinary(os.path.realpath(args.binary_settings))
+        if not ok:
+            logging.critical(error)
+            exit(1)
+
+    # Export the resulting settings to the standard output; they are streamed
+    # to its file descriptor as they are serialized
+    sys.stdout.flush()
+    ok, error = pfw.exportDomainsXmlToFd(sys.stdout.fileno(),
+            args.binary_settings is None)
+    if not ok:
+        logging.critical(error)
+        exit(1)
+
+    # The manifest is written last: it validates the output
+    if manifest is not None:
+        manifest.save(args.manifest)
@@ -39,6 +39,14 @@ def configure(infile=sys.stdin, outfile=sys.stdout, serverPort=None, structPath=
     and change the structure path to absolute."""
 
     dom = xml.dom.minidom.parse(infile)
+    configureDocument(dom, serverPort, structPath)
+
+    outfile.write(dom.toxml())
+
+def configureDocument(dom, serverPort=None, structPath=None):
+    """ Format a parsed xml PFW config file for simulation, in place.
+
+    See configure."""
 
     for node in dom.getElementsByTagName("ParameterFrameworkConfiguration"):
         if serverPort is not None:
@@ -55,8 +63,6 @@ def configure(infile=sys.stdin, outfile=sys.stdout, serverPort=None, structPath=
         for node in dom.getElementsByTagName("StructureDescriptionFileLocation"):
             node.setAttribute("Path", structPath + "/" + node.getAttribute("Path"))
 
-    outfile.write(dom.toxml())
-
 if __name__ == "__main__" :
     """ Execute main if the python interpreter is running this module as the main program """
 
@@ -39,6 +39,7 @@ common_src_files := \
         XmlMemoryDocSource.cpp \
         XmlStringDocSink.cpp \
         XmlFileDocSink.cpp \
+        XmlFdDocSink.cpp \
         XmlFileDocSource.cpp \
         XmlStringDocSource.cpp
 
@@ -0,0 +1,63 @@
+/*
+ * Copyright (c) 2015, Intel Corporation
+ * All rights reserved.
+ *
+ * Redistribution and use in source and binary forms, with or without modification,
+ * are permitted provided that the following conditions are met:
+ *
+ * 1. Redistributions of source code must retain the above copyright notice, this
+ * list of conditions and the following disclaimer.
+ *
+ * 2. Redistributions in binary form must reproduce the above copyright notice,
+ * this list of conditions and the following disclaimer in the documentation and/or
+ * other materials provided with the distribution.
+ *
+ * 3. Neither the name of the copyright holder nor the names of its contributors
+ * may be used to endorse or promote products derived from this software without
+ * specific prior written permission.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+ * ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+ * WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+ * DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR
+ * ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+ * (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+ * LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON
+ * ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+ * (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+ * SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ */
+
+#include "XmlFdDocSink.h"
+#include <libxml/parser.h>
+#include <libxml/xmlIO.h>
+
+#define base CXmlDocSink
+
+CXmlFdDocSink::CXmlFdDocSink(int iFd):
+     _iFd(iFd)
+{
+}
+
+bool CXmlFdDocSink::doProcess(CXmlDocSource& xmlDocSource,
+                              CXmlSerializingContext& serializingContext)
+{
+    xmlOutputBufferPtr pOutputBuffer =
+        xmlOutputBufferCreateFd(_iFd, xmlFindCharEncodingHandler("UTF-8"));
+
+    if (!pOutputBuffer) {
+
+        serializingContext.setError("Unable to create an output buffer on the file descriptor");
+
+        return false;
+    }
+
+    // Write document (formatted); the output buffer is released by libxml2
+    if (xmlSaveFormatFileTo(pOutputBuffer, xmlDocSource.getDoc(), "UTF-8", 1) == -1) {
+
+        serializingContext.setError("Could not write to the file descriptor");
+
+        return false;
+    }
+    return true;
+}
@@ -30,6 +30,7 @@
 
 #include "XmlStringDocSource.h"
 #include <libxml/parser.h>
+#include <libxml/xinclude.h>
 
 #define base CXmlDocSource
 
@@ -48,7 +49,45 @@ CXmlStringDocSource::CXmlStringDocSource(const std::string& strXmlInput,
 {
 }
 
+CXmlStringDocSource::CXmlStringDocSource(const std::string& strXmlInput,
+                                         const std::string& strXmlBaseUrl,
+                                         const std::string& strXmlSchemaFile,
+                                         const std::string& strRootElementType,
+                                         const std::string& strRootElementName,
+                                         const std::string& strNameAttrituteName,
+                                         bool bValidateWithSchema) :
+    base(readString(strXmlInput, strXmlBaseUrl),
+         strXmlSchemaFile,
+         strRootElementType,
+         strRootElementName,
+         strNameAttrituteName,
+         bValidateWithSchema)
+{
+}
+
 bool CXmlStringDocSource::populate(CXmlSerializingContext &serializingContext)
 {
     return validate(serializingContext);
 }
+
+_xmlDoc* CXmlStringDocSource::readString(const std::string& strXmlInput,
+                                         const std::string& strXmlBaseUrl)
+{
+    // Read xml description
+    xmlDocPtr pDoc = xmlReadMemory(strXmlInput.c_str(), (int)strXmlInput.size(),
+                                   strXmlBaseUrl.c_str(), NULL, 0);
+
+    if (!pDoc) {
+
+        return NULL;
+    }
+    // Process file inclusion
+    // WARNING: this symbol is available if libxml2 has been compiled with LIBXML_XINCLUDE_ENABLED
+    if (xmlXIncludeProcess(pDoc) < 0) {
+
+        xmlFreeDoc(pDoc);
+        return NULL;
+    }
+
+    return pDoc;
+}
@@ -56,6 +56,26 @@ public:
                         const std::string& strNameAttrituteName,
                         bool bValidateWithSchema);
 
+    /**
+      * Constructor processing the inclusions of the document, as CXmlFileDocSource does
+      *
+      * @param[in] strXmlInput a string containing an xml description
+      * @param[in] strXmlBaseUrl the URL against which relative inclusions are resolved; if empty,
+      *            they are resolved against the current directory
+      * @param[in] strXmlSchemaFile a string containing the path to the schema file
+      * @param[in] strRootElementType a string containing the root element type
+      * @param[in] strRootElementName a string containing the root element name
+      * @param[in] strNameAttributeName a string containing the name of the root name attribute
+      * @param[in] bValidateWithSchema a boolean that toggles schema validation
+      */
+    CXmlStringDocSource(const std::string& strXmlInput,
+                        const std::string& strXmlBaseUrl,
+                        const std::string& strXmlSchemaFile,
+                        const std::string& strRootElementType,
+                        const std::string& strRootElementName,
+                        const std::string& strNameAttrituteName,
+                        bool bValidateWithSchema);
+
     /**
       * CXmlDocSource method implementation.
       *
@@ -64,6 +84,20 @@ public:
       * @return false if any error occurs
       */
     virtual bool populate(CXmlSerializingContext& serializingContext);
+
+private:
+    /**
+     * Read xml string
+     *
+     * This function reads an xml description and processes eventual included files
+     * WARNING: to compile this function, libxml2 has to be compiled with LIBXML_XINCLUDE_ENABLED
+     *
+     * @param[in] strXmlInput the xml description
+     * @param[in] strXmlBaseUrl the URL against which relative inclusions are resolved
+     *
+     * @return a pointer to generated xml document object
+     */
+    static _xmlDoc* readString(const std::string& strXmlInput, const std::string& strXmlBaseUrl);
 };
 
 